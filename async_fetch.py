@@ -0,0 +1,127 @@
+import asyncio
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from market_data import _normalize
+
+YAHOO_CHART_URL = 'https://query1.finance.yahoo.com/v8/finance/chart'
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    pass
+
+
+# Token bucket: `rate` requests per second with bursts up to `capacity`
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# Yahoo chart JSON -> the OHLCV frame yf.download returns
+def parse_chart(payload):
+    chart = payload.get('chart', {})
+    if chart.get('error'):
+        raise FetchError(chart['error'])
+    result = chart['result'][0]
+    timestamps = result.get('timestamp') or []
+    quote = result['indicators']['quote'][0]
+    index = pd.to_datetime(timestamps, unit='s', utc=True)
+    timezone = result.get('meta', {}).get('exchangeTimezoneName')
+    if timezone:
+        index = index.tz_convert(timezone)
+    frame = pd.DataFrame({
+        'Open': quote.get('open'),
+        'High': quote.get('high'),
+        'Low': quote.get('low'),
+        'Close': quote.get('close'),
+        'Volume': quote.get('volume'),
+    }, index=index, dtype=float)
+    adjclose = result['indicators'].get('adjclose')
+    frame['Adj Close'] = np.asarray(adjclose[0]['adjclose'], dtype=float) if adjclose else frame['Close']
+    frame = frame.dropna(how='all')
+    frame['Volume'] = frame['Volume'].fillna(0).astype(np.int64)
+    return _normalize(frame)
+
+
+# Concurrent chart fetcher: one pooled aiohttp session, bounded concurrency, a token-bucket
+# rate limit and retries with exponential backoff. base_url can point at a local mock server.
+class AsyncFetcher:
+    def __init__(self, base_url=YAHOO_CHART_URL, concurrency=8, rate=5.0, retries=3, backoff=0.5, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self.rate = rate
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+    @staticmethod
+    def _params(interval, start=None, end=None, period=None):
+        params = {'interval': interval, 'includeAdjustedClose': 'true'}
+        if start is not None:
+            params['period1'] = int(pd.Timestamp(start).timestamp())
+            params['period2'] = int(pd.Timestamp(end).timestamp()) if end is not None else int(time.time())
+        else:
+            params['range'] = period or 'max'
+        return params
+
+    async def _fetch(self, session, semaphore, bucket, symbol, interval, start=None, end=None, period=None):
+        import aiohttp
+
+        url = f'{self.base_url}/{symbol}'
+        params = self._params(interval, start=start, end=end, period=period)
+        for attempt in range(self.retries + 1):
+            await bucket.acquire()
+            try:
+                async with semaphore, session.get(url, params=params) as response:
+                    if response.status == 200:
+                        return parse_chart(await response.json(content_type=None))
+                    if response.status not in RETRY_STATUSES:
+                        raise FetchError(f'{symbol}: HTTP {response.status}')
+                    error = FetchError(f'{symbol}: HTTP {response.status}')
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                error = exc
+            if attempt < self.retries:
+                await asyncio.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+        raise error
+
+    # requests: iterable of dicts with symbol, interval and start/end or period.
+    # Returns {(symbol, interval): DataFrame or the exception that ended its retries}.
+    async def fetch_many(self, requests):
+        import aiohttp
+
+        requests = list(requests)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        bucket = TokenBucket(self.rate)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            tasks = [self._fetch(session, semaphore, bucket, **request) for request in requests]
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        return {(request['symbol'], request['interval']): outcome for request, outcome in zip(requests, outcomes)}
+
+
+# Blocking wrapper: fetch many symbols at once with the same window
+def download_many(symbols, period=None, interval='1d', start=None, end=None, **fetcher_options):
+    requests = [{'symbol': symbol, 'interval': interval, 'start': start, 'end': end, 'period': period}
+                for symbol in symbols]
+    outcomes = asyncio.run(AsyncFetcher(**fetcher_options).fetch_many(requests))
+    return {symbol: outcomes[(symbol, interval)] for symbol in symbols}
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+BUY, SELL, HOLD = 1, -1, 0
+
+# Bars per year for each yfinance interval, used to annualize the Sharpe ratio. Intraday counts
+# assume the ~23-hour sessions of the futures this repo analyses (CL=F, NG=F) over 252 trading days;
+# pass periods_per_year explicitly for other sessions (e.g. 7 * 252 for hourly US equities).
+TRADING_DAYS = 252
+SESSION_MINUTES = 23 * 60
+BARS_PER_YEAR = {
+    **{f'{minutes}m': TRADING_DAYS * SESSION_MINUTES / minutes for minutes in (1, 2, 5, 15, 30, 60, 90)},
+    '1h': TRADING_DAYS * SESSION_MINUTES / 60,
+    '1d': TRADING_DAYS,
+    '5d': TRADING_DAYS / 5,
+    '1wk': 52,
+    '1mo': 12,
+    '3mo': 4,
+}
+
+
+# Map a Signal column ('Buy'/'Sell'/None/'Hold') to int8 codes: +1 buy, -1 sell, 0 keep current position
+def signal_codes(signal):
+    signal = np.asarray(signal, dtype=object)
+    return np.select([signal == 'Buy', signal == 'Sell'], [BUY, SELL], default=HOLD).astype(np.int8)
+
+
+# Positions from signal codes (1-D or variants x bars): each Buy/Sell sets the position and it is
+# held until the next signal; flat before the first signal
+def positions_from_codes(codes):
+    codes = np.atleast_2d(codes)
+    bars = np.arange(codes.shape[1])
+    last = np.maximum.accumulate(np.where(codes != HOLD, bars, 0), axis=1)
+    return np.take_along_axis(codes, last, axis=1).astype(np.float64)
+
+
+# Max drawdown of each equity curve (rows), as a positive fraction of the running peak
+def max_drawdown(equity):
+    peak = np.maximum.accumulate(equity, axis=-1)
+    return np.max(1 - equity / peak, axis=-1)
+
+
+# Score one or many signal variants against the same Close array in one batched call.
+# Positions act from the next bar (no look-ahead): pnl[t] = position[t-1] * return[t].
+# periods_per_year defaults to hourly bars (the interval all the scripts download); see BARS_PER_YEAR.
+def backtest(close, signals, cost=0.0, periods_per_year=BARS_PER_YEAR['1h']):
+    close = np.asarray(close, dtype=float)
+    codes = signals if np.issubdtype(np.asarray(signals).dtype, np.integer) else signal_codes(signals)
+    squeeze = np.ndim(codes) == 1
+    positions = positions_from_codes(codes)
+
+    returns = np.zeros_like(close)
+    returns[1:] = close[1:] / close[:-1] - 1
+    returns = np.nan_to_num(returns)
+
+    held = np.zeros_like(positions)
+    held[:, 1:] = positions[:, :-1]
+    turnover = np.abs(np.diff(held, axis=1, prepend=0))
+    pnl = held * returns - cost * turnover
+    equity = np.cumprod(1 + pnl, axis=1)
+
+    in_market = held != 0
+    bars_in_market = in_market.sum(axis=1)
+    wins = ((pnl > 0) & in_market).sum(axis=1)
+    mean, std = pnl.mean(axis=1), pnl.std(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hit_rate = np.where(bars_in_market > 0, wins / bars_in_market, np.nan)
+        sharpe = np.where(std > 0, mean / std * np.sqrt(periods_per_year), np.nan)
+
+    result = {
+        'total_return': equity[:, -1] - 1,
+        'hit_rate': hit_rate,
+        'sharpe': sharpe,
+        'max_drawdown': max_drawdown(equity),
+        'trades': (turnover > 0).sum(axis=1),
+        'positions': positions,
+        'pnl': pnl,
+        'equity': equity,
+    }
+    if squeeze:
+        result = {key: value[0] for key, value in result.items()}
+    return result
+
+
+# Per-bar backtest columns and summary metrics for a frame with Close and Signal
+def backtest_frame(data, column='Signal', cost=0.0, periods_per_year=BARS_PER_YEAR['1h']):
+    result = backtest(data['Close'], data[column], cost=cost, periods_per_year=periods_per_year)
+    frame = pd.DataFrame({
+        'Position': result['positions'],
+        'PnL': result['pnl'],
+        'Equity': result['equity'],
+    }, index=data.index)
+    metrics = {key: result[key] for key in ('total_return', 'hit_rate', 'sharpe', 'max_drawdown', 'trades')}
+    return frame, metrics
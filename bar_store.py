@@ -0,0 +1,157 @@
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from indicators import rolling_means
+from wyckoff import wyckoff_codes
+
+DEFAULT_CHUNK = 1 << 20
+
+
+# On-disk bar store: one contiguous raw array file per column per symbol, opened as np.memmap.
+#   <root>/<symbol>/meta.json       {"length": n, "columns": {name: dtype}, "derived": [names]}
+#   <root>/<symbol>/<column>.bin    raw little-endian values, the index is stored as int64 ns
+# Derived (indicator) columns are dropped when new bars are appended, so they never go stale.
+class BarStore:
+    def __init__(self, root='bar_store'):
+        self.root = root
+
+    def _dir(self, symbol):
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9_.-]', '_', symbol))
+
+    def _file(self, symbol, column):
+        return os.path.join(self._dir(symbol), f'{column}.bin')
+
+    def meta(self, symbol):
+        path = os.path.join(self._dir(symbol), 'meta.json')
+        if not os.path.exists(path):
+            return {'length': 0, 'columns': {}, 'derived': []}
+        with open(path) as handle:
+            return json.load(handle)
+
+    def _write_meta(self, symbol, meta):
+        path = os.path.join(self._dir(symbol), 'meta.json')
+        with open(path + '.tmp', 'w') as handle:
+            json.dump(meta, handle)
+        os.replace(path + '.tmp', path)
+
+    def length(self, symbol):
+        return self.meta(symbol)['length']
+
+    # Append OHLCV bars (a DataFrame with a DatetimeIndex) to the end of every column file. Bars at or
+    # before the last stored timestamp (an overlapping re-download) are skipped. Everything is validated
+    # before the store is touched, and each column file is cut back to the length in meta.json first,
+    # so a write that died half way never leaves stray bytes behind.
+    def append(self, symbol, frame):
+        meta = self.meta(symbol)
+        index = pd.DatetimeIndex(frame.index)
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        stamps = index.as_unit('ns').asi8
+        if len(stamps) > 1 and not (np.diff(stamps) > 0).all():
+            raise ValueError("Bars must have strictly increasing timestamps")
+        raw = set(meta['columns']) - set(meta['derived'])
+        if meta['length'] and {'index', *frame.columns} != raw:
+            raise ValueError(f"Columns {sorted(['index', *frame.columns])} do not match the stored {sorted(raw)}")
+        if meta['length']:
+            keep = stamps > self.column(symbol, 'index')[-1]
+            frame, stamps = frame[keep], stamps[keep]
+        if not len(frame):
+            return 0
+        if meta['derived']:
+            derived, meta['derived'] = meta['derived'], []
+            for column in derived:
+                del meta['columns'][column]
+            self._write_meta(symbol, meta)
+            for column in derived:
+                os.remove(self._file(symbol, column))
+
+        os.makedirs(self._dir(symbol), exist_ok=True)
+        arrays = {'index': stamps}
+        for column in frame.columns:
+            arrays[column] = frame[column].to_numpy(dtype=np.float64)
+        for column, values in arrays.items():
+            with open(self._file(symbol, column), 'ab') as handle:
+                handle.truncate(meta['length'] * values.dtype.itemsize)
+                handle.write(np.ascontiguousarray(values).tobytes())
+            meta['columns'][column] = values.dtype.str
+        meta['length'] += len(frame)
+        self._write_meta(symbol, meta)
+        return len(frame)
+
+    # Read-only memory map of one column; nothing is loaded until sliced
+    def column(self, symbol, column):
+        meta = self.meta(symbol)
+        return np.memmap(self._file(symbol, column), dtype=meta['columns'][column], mode='r',
+                         shape=(meta['length'],))
+
+    # Writable memory map for a derived column of the full length (created or overwritten)
+    def create_column(self, symbol, column, dtype=np.float64):
+        meta = self.meta(symbol)
+        if not meta['length']:
+            raise ValueError(f"No bars stored for {symbol!r}; append bars before creating columns")
+        dtype = np.dtype(dtype)
+        array = np.memmap(self._file(symbol, column), dtype=dtype, mode='w+', shape=(meta['length'],))
+        meta['columns'][column] = dtype.str
+        if column not in meta['derived']:
+            meta['derived'].append(column)
+        self._write_meta(symbol, meta)
+        return array
+
+    def index(self, symbol, start=0, stop=None):
+        return pd.to_datetime(np.asarray(self.column(symbol, 'index')[start:stop]), utc=True)
+
+    # Load a slice of columns into a DataFrame (for plotting or exporting a window)
+    def read(self, symbol, columns=None, start=0, stop=None):
+        meta = self.meta(symbol)
+        columns = columns or [name for name in meta['columns'] if name != 'index']
+        data = {name: np.asarray(self.column(symbol, name)[start:stop]) for name in columns}
+        return pd.DataFrame(data, index=self.index(symbol, start, stop))
+
+
+# Chunk boundaries over [0, length)
+def _chunks(length, chunk_size):
+    for start in range(0, length, chunk_size):
+        yield start, min(start + chunk_size, length)
+
+
+# Trailing means over a memory-mapped column, one chunk (plus window - 1 bars of history) at a time
+def rolling_mean_chunked(source, target, window, chunk_size=DEFAULT_CHUNK):
+    for start, stop in _chunks(len(source), chunk_size):
+        lead = min(start, window - 1)
+        values = np.asarray(source[start - lead:stop], dtype=float)
+        target[start:stop] = rolling_means(values, [window])[window][lead:]
+    target.flush()
+    return target
+
+
+# Moving averages over the store, written as <window>_MA columns
+def moving_averages_chunked(store, symbol, windows=(50, 200), chunk_size=DEFAULT_CHUNK):
+    close = store.column(symbol, 'Close')
+    for window in windows:
+        rolling_mean_chunked(close, store.create_column(symbol, f'{window}_MA'), window, chunk_size)
+
+
+# Volume Oscillator over the store, written as Short_Vol_MA / Long_Vol_MA / Vol_Osc columns
+def volume_oscillator_chunked(store, symbol, short_period=14, long_period=28, chunk_size=DEFAULT_CHUNK):
+    volume = store.column(symbol, 'Volume')
+    short = rolling_mean_chunked(volume, store.create_column(symbol, 'Short_Vol_MA'), short_period, chunk_size)
+    long = rolling_mean_chunked(volume, store.create_column(symbol, 'Long_Vol_MA'), long_period, chunk_size)
+    oscillator = store.create_column(symbol, 'Vol_Osc')
+    for start, stop in _chunks(len(volume), chunk_size):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            oscillator[start:stop] = (short[start:stop] - long[start:stop]) / long[start:stop] * 100
+    oscillator.flush()
+
+
+# Wyckoff phase codes (index into wyckoff.PHASES) over the store, written as an int8 Phase column
+def wyckoff_chunked(store, symbol, chunk_size=DEFAULT_CHUNK):
+    close = store.column(symbol, 'Close')
+    ma_50, ma_200 = store.column(symbol, '50_MA'), store.column(symbol, '200_MA')
+    phase = store.create_column(symbol, 'Phase', dtype=np.int8)
+    for start, stop in _chunks(len(close), chunk_size):
+        phase[start:stop] = wyckoff_codes(close[start:stop], ma_50[start:stop], ma_200[start:stop])
+    phase.flush()
@@ -0,0 +1,140 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from indicators import moving_averages, oscillator_array, volume_oscillator
+from peaks import peak_types
+from signals import high_amplitude_wyckoff_signals
+from spectral import SpectralEngine, high_amplitude_series, rfft_frequencies
+from tests.synthetic import synthetic_ohlcv
+from wyckoff import wyckoff_method
+
+SIZES = {'1k': 1_000, '100k': 100_000, '10m': 10_000_000}
+
+
+# Each case gets a prepared frame and times only its own step
+def _prepared(data):
+    data = volume_oscillator(moving_averages(data.copy()))
+    data['Significant'] = high_amplitude_series(oscillator_array(data))
+    return wyckoff_method(data)
+
+
+# A universe of `rows` oscillator windows (shifted copies of one series) for the batched spectral scan
+def _universe(data, rows=500, length=2048):
+    values = oscillator_array(volume_oscillator(data.copy()))
+    length = min(length, len(values))
+    return np.stack([np.roll(values, 7 * row)[:length] for row in range(rows)])
+
+
+# The per-symbol path SpectralEngine.scan replaces: one rfft, peak pick and reconstruction per row
+def _scan_per_symbol(windows):
+    results = []
+    for window in windows:
+        amplitudes = np.abs(np.fft.rfft(window))
+        peak = 1 + np.argmax(amplitudes[1:])
+        results.append((rfft_frequencies(len(window))[peak], amplitudes[peak],
+                        high_amplitude_series(window, percentile=90)))
+    return results
+
+
+CASES = {
+    'moving_averages': (lambda data: data.copy(), lambda data: moving_averages(data)),
+    'volume_oscillator': (lambda data: data.copy(), lambda data: volume_oscillator(data)),
+    'fft_high_amplitude': (lambda data: oscillator_array(volume_oscillator(data.copy())),
+                           lambda values: high_amplitude_series(values, percentile=90)),
+    'wyckoff_method': (lambda data: moving_averages(data.copy()), lambda data: wyckoff_method(data)),
+    'peak_detection': (lambda data: oscillator_array(volume_oscillator(data.copy())),
+                       lambda values: peak_types(values, distance=10)),
+    'universe_scan': (_universe, lambda windows: SpectralEngine().scan(windows, reconstruct_series=True)),
+    'universe_scan_per_symbol': (_universe, _scan_per_symbol),
+    'signal_generation': (_prepared,
+                          lambda data: high_amplitude_wyckoff_signals(data, data['Significant'].to_numpy())),
+}
+
+
+# Best-of-`repeat` wall time, then one separate traced run for peak memory (tracing skews timings)
+def run_case(setup, func, data, repeat):
+    times = []
+    for _ in range(repeat):
+        prepared = setup(data)
+        gc.collect()
+        start = time.perf_counter()
+        func(prepared)
+        times.append(time.perf_counter() - start)
+        del prepared
+
+    prepared = setup(data)
+    gc.collect()
+    tracemalloc.start()
+    func(prepared)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'seconds': min(times), 'peak_bytes': peak}
+
+
+def run_benchmarks(sizes, cases=None, repeat=3):
+    results = {}
+    for size in sizes:
+        data = synthetic_ohlcv(SIZES[size])
+        for name in cases or CASES:
+            setup, func = CASES[name]
+            key = f'{name}[{size}]'
+            results[key] = run_case(setup, func, data, repeat if SIZES[size] < 10_000_000 else 1)
+            print(f"{key}: {results[key]['seconds'] * 1e3:.2f} ms, {results[key]['peak_bytes'] / 2**20:.1f} MiB peak")
+    return results
+
+
+# Cases that got slower (or hungrier) than the baseline by more than the tolerance factor
+def find_regressions(results, baseline, tolerance=1.25, min_seconds=5e-3):
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        if current['seconds'] > max(previous['seconds'], min_seconds) * tolerance:
+            regressions.append(f"{key}: {previous['seconds']:.4f}s -> {current['seconds']:.4f}s")
+        if current['peak_bytes'] > previous['peak_bytes'] * tolerance and current['peak_bytes'] > 2**20:
+            regressions.append(f"{key}: {previous['peak_bytes']} -> {current['peak_bytes']} bytes peak")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time the indicator, FFT and Wyckoff hot paths on synthetic bars')
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=['1k', '100k'])
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=None)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', default='bench_baseline.json')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=1.25)
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.cases, args.repeat)
+    report = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(args.output, 'w') as handle:
+        json.dump(report, handle, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as handle:
+            json.dump(report, handle, indent=2)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)['results']
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if regressions else 0)
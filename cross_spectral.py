@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.fft import irfft, next_fast_len, rfft
+from scipy.signal import csd, welch
+
+
+# Align the volume oscillator with price on their common, NaN-free bars.
+# price='returns' correlates against Close returns (stationary); 'level' uses Close itself.
+def align(vol_osc, close, price='returns'):
+    if price == 'returns':
+        close = close.pct_change()
+    frame = pd.concat({'x': vol_osc, 'y': close}, axis=1, join='inner').dropna()
+    return frame['x'].to_numpy(dtype=float), frame['y'].to_numpy(dtype=float), frame.index
+
+
+def _standardize(values):
+    values = np.asarray(values, dtype=float)
+    values = values - values.mean(axis=-1, keepdims=True)
+    std = values.std(axis=-1, keepdims=True)
+    return np.divide(values, std, out=np.zeros_like(values), where=std > 0)
+
+
+# Normalized cross-correlation over lags -max_lag..max_lag via FFT, along the last axis (batched).
+# corr[lag] = corr(x[t], y[t + lag]); a peak at a positive lag means x (volume) leads y (price).
+def cross_correlation(x, y, max_lag=None):
+    x, y = _standardize(x), _standardize(y)
+    n = x.shape[-1]
+    max_lag = n - 1 if max_lag is None else min(max_lag, n - 1)
+    size = next_fast_len(2 * n - 1, real=True)
+    full = irfft(np.conj(rfft(x, size, axis=-1)) * rfft(y, size, axis=-1), size, axis=-1) / n
+    lags = np.arange(-max_lag, max_lag + 1)
+    return lags, np.concatenate([full[..., size - max_lag:], full[..., :max_lag + 1]], axis=-1)
+
+
+# Lag (bars) and value of the strongest absolute cross-correlation, per row
+def lead_lag(x, y, max_lag=50):
+    lags, corr = cross_correlation(x, y, max_lag)
+    best = np.argmax(np.abs(corr), axis=-1)
+    return lags[best], np.take_along_axis(corr, best[..., None], axis=-1)[..., 0]
+
+
+# Welch coherence and phase lag between x and y along the last axis (batched).
+# lag_bars > 0 means x leads y at that frequency.
+def coherence_phase(x, y, segment=256, overlap=0.5):
+    segment = min(segment, np.shape(x)[-1])
+    noverlap = int(segment * overlap)
+    frequencies, sxy = csd(x, y, nperseg=segment, noverlap=noverlap, axis=-1)
+    _, sxx = welch(x, nperseg=segment, noverlap=noverlap, axis=-1)
+    _, syy = welch(y, nperseg=segment, noverlap=noverlap, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        coherence = np.abs(sxy) ** 2 / (sxx * syy)
+        phase = np.angle(sxy)
+        lag_bars = np.where(frequencies > 0, -phase / (2 * np.pi * frequencies), np.nan)
+    return {'frequencies': frequencies, 'coherence': coherence, 'phase': phase, 'lag_bars': lag_bars}
+
+
+# Lead/lag and peak coherence over rolling windows of `window` bars every `hop` bars, all windows
+# transformed as one batch. Returns one row per window, labelled by the window's last bar.
+def rolling_cross_spectrum(x, y, window=500, hop=50, max_lag=50, segment=128, index=None):
+    if len(x) != len(y):
+        raise ValueError(f"x and y must be aligned, got {len(x)} and {len(y)} bars")
+    if len(x) < window:
+        raise ValueError(f"Need at least window={window} aligned bars, got {len(x)}")
+    x_windows = sliding_window_view(np.asarray(x, dtype=float), window)[::hop]
+    y_windows = sliding_window_view(np.asarray(y, dtype=float), window)[::hop]
+    lags, corr = lead_lag(x_windows, y_windows, max_lag)
+    spectrum = coherence_phase(x_windows, y_windows, segment=segment)
+    coherence = np.nan_to_num(spectrum['coherence'][..., 1:])
+    peak = 1 + np.argmax(coherence, axis=-1)
+    rows = np.arange(len(peak))
+    ends = np.arange(window - 1, len(x), hop)[:len(peak)]
+    return pd.DataFrame({
+        'lag': lags,
+        'correlation': corr,
+        'peak_frequency': spectrum['frequencies'][peak],
+        'peak_coherence': spectrum['coherence'][rows, peak],
+        'peak_lag_bars': spectrum['lag_bars'][rows, peak],
+    }, index=ends if index is None else index[ends])
+
+
+# Lead/lag, correlation and peak coherence for many symbols at once. frames: {symbol: frame with
+# Vol_Osc and Close}. Every series is cut to the most recent `length` aligned bars (default: the
+# shortest) so the whole batch goes through one set of 2-D transforms.
+def cross_spectrum_many(frames, length=None, max_lag=50, segment=256, price='returns'):
+    aligned = {symbol: align(frame['Vol_Osc'], frame['Close'], price=price)[:2] for symbol, frame in frames.items()}
+    length = length or min(len(x) for x, _ in aligned.values())
+    x = np.stack([x[-length:] for x, _ in aligned.values()])
+    y = np.stack([y[-length:] for _, y in aligned.values()])
+    lags, corr = lead_lag(x, y, max_lag)
+    spectrum = coherence_phase(x, y, segment=segment)
+    peak = 1 + np.argmax(np.nan_to_num(spectrum['coherence'][:, 1:]), axis=-1)
+    rows = np.arange(len(peak))
+    return pd.DataFrame({
+        'lag': lags,
+        'correlation': corr,
+        'peak_frequency': spectrum['frequencies'][peak],
+        'peak_coherence': spectrum['coherence'][rows, peak],
+        'peak_lag_bars': spectrum['lag_bars'][rows, peak],
+    }, index=pd.Index(list(aligned), name='Symbol'))
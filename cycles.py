@@ -0,0 +1,174 @@
+import numpy as np
+from scipy.fft import rfft
+from scipy.signal import lfilter
+
+
+# Vertex of the parabola through three (x, y) points; falls back to the middle point when the
+# points are not concave (no interior maximum)
+def _parabola_vertex(x, y):
+    (x0, x1, x2), (y0, y1, y2) = x, y
+    denominator = (x0 - x1) * (x0 - x2) * (x1 - x2)
+    a = (x2 * (y1 - y0) + x1 * (y0 - y2) + x0 * (y2 - y1)) / denominator
+    b = (x2 * x2 * (y0 - y1) + x1 * x1 * (y2 - y0) + x0 * x0 * (y1 - y2)) / denominator
+    if a >= 0:
+        return x1, y1
+    vertex = min(max(-b / (2 * a), min(x0, x2)), max(x0, x2))
+    return vertex, y1 + a * (vertex * vertex - x1 * x1) + b * (vertex - x1)
+
+
+# Both detectors below report a cycle the same way:
+#   amplitude:  estimated amplitude of the sinusoid at that period, in the signal's units
+#   confidence: share of the signal's variance that sinusoid explains (amplitude**2 / 2 / variance), 0..1
+
+
+# Sub-bin peak of a power spectrum within a band of periods (bars per cycle). power is |rfft|**2 of
+# segments tapered with `window` (averaged over segments for Welch). The peak bin and its neighbours
+# are fitted with a parabola in log power (accurate for Hann-windowed spectra).
+def spectrum_peak(frequencies, power, window, min_period=2, max_period=None):
+    frequencies = np.asarray(frequencies, dtype=float)
+    power = np.asarray(power, dtype=float)
+    window = np.asarray(window, dtype=float)
+    band = (frequencies > 0) & (frequencies <= 1 / min_period)
+    if max_period:
+        band &= frequencies >= 1 / max_period
+    bins = np.flatnonzero(band)
+    if not len(bins):
+        raise ValueError("No frequency bins inside the requested period band")
+    peak = bins[np.argmax(power[bins])]
+
+    frequency, peak_power = frequencies[peak], power[peak]
+    if 0 < peak < len(power) - 1 and power[peak] > 0:
+        log_power = np.log(np.maximum(power[peak - 1:peak + 2], np.finfo(float).tiny))
+        frequency, log_peak = _parabola_vertex(frequencies[peak - 1:peak + 2], log_power)
+        peak_power = np.exp(log_peak)
+
+    # A sinusoid of amplitude A peaks at |X| = A * sum(window) / 2; Parseval gives the variance
+    # from the two-sided spectrum (every bin but DC and Nyquist counted twice)
+    n = len(window)
+    two_sided = 2 * power.sum() - power[0] - (power[-1] if n % 2 == 0 else 0)
+    variance = two_sided / (n * np.sum(window ** 2))
+    amplitude = 2 * np.sqrt(peak_power) / window.sum()
+    return {
+        'frequency': frequency,
+        'period': 1 / frequency,
+        'amplitude': amplitude,
+        'confidence': min(1.0, amplitude ** 2 / 2 / variance) if variance > 0 else 0.0,
+    }
+
+
+# Dominant cycle of a whole series: one Hann-windowed rfft of the de-meaned series, searched only
+# inside [min_period, max_period] (no DC, no negative frequencies) and refined below bin spacing
+def dominant_cycle(signal, min_period=2, max_period=None):
+    signal = np.nan_to_num(np.asarray(signal, dtype=float))
+    n = len(signal)
+    window = np.hanning(n)
+    power = np.abs(rfft((signal - signal.mean()) * window)) ** 2
+    return spectrum_peak(np.fft.rfftfreq(n), power, window, min_period=min_period, max_period=max_period)
+
+
+# Candidate periods (sorted) with extra ones inserted wherever neighbours are more than
+# 1 / (oversample * n) apart in frequency. An n-bar DFT's main lobe is +-1/n wide, so on the
+# denser grid a cycle anywhere in the band lands next to the top of its own lobe.
+def dense_periods(periods, n, oversample=4):
+    frequencies = np.unique(1.0 / np.asarray(periods, dtype=float))
+    steps = np.maximum(1, np.ceil(np.diff(frequencies) * oversample * n)).astype(int)
+    dense = [np.linspace(low, high, step, endpoint=False)
+             for low, high, step in zip(frequencies[:-1], frequencies[1:], steps)]
+    return np.sort(1.0 / np.concatenate(dense + [frequencies[-1:]]))
+
+
+# DFT of the de-meaned signal at arbitrary (non-integer) periods with the Goertzel recursion,
+# one C-level lfilter pass per period: O(n) each, instead of a full FFT for a handful of periods
+def goertzel(signal, periods):
+    signal = np.nan_to_num(np.asarray(signal, dtype=float))
+    signal = signal - signal.mean()
+    n = len(signal)
+    values = np.empty(len(periods), dtype=complex)
+    for i, period in enumerate(periods):
+        omega = 2 * np.pi / period
+        state = lfilter([1.0], [1.0, -2 * np.cos(omega), 1.0], signal)
+        # Phase-aligned so it equals sum(x[t] * exp(-1j * omega * t))
+        values[i] = (state[-1] - np.exp(-1j * omega) * state[-2]) * np.exp(-1j * omega * (n - 1))
+    return values
+
+
+# Best of a set of candidate periods, refined between neighbouring candidates with a parabola in
+# log power (see the amplitude / confidence definitions above)
+def _best_period(periods, power, variance, n):
+    peak = int(np.argmax(power))
+    period, peak_power = periods[peak], power[peak]
+    if 0 < peak < len(periods) - 1 and power[peak] > 0:
+        log_power = np.log(np.maximum(power[peak - 1:peak + 2], np.finfo(float).tiny))
+        period, log_peak = _parabola_vertex(periods[peak - 1:peak + 2], log_power)
+        peak_power = np.exp(log_peak)
+    amplitude = 2 * np.sqrt(peak_power) / n
+    confidence = min(1.0, amplitude ** 2 / 2 / variance) if variance > 0 else 0.0
+    return {'frequency': 1 / period, 'period': period, 'amplitude': amplitude, 'confidence': confidence}
+
+
+# Dominant cycle within the band of candidate periods (e.g. np.arange(20, 80, 2)) via Goertzel.
+# The candidates are densified first (dense_periods), so a cycle between two of them is still found
+# and refined to sub-candidate accuracy.
+def band_cycle(signal, periods):
+    signal = np.nan_to_num(np.asarray(signal, dtype=float))
+    periods = dense_periods(periods, len(signal))
+    power = np.abs(goertzel(signal, periods)) ** 2
+    return _best_period(periods, power, signal.var(), len(signal))
+
+
+# Per-bar tracker of a band of candidate periods over the last `window` bars, densified for the
+# window length like band_cycle, so each update equals band_cycle on the current window. Each
+# candidate's DFT term is slid in O(1) per bar (exact at any period, not just FFT bins), so tracking
+# m periods costs O(m) per bar. Sums are recomputed exactly every `resync` bars to stop round-off drift.
+class GoertzelTracker:
+    def __init__(self, window, periods, resync=None):
+        self.window = window
+        self.periods = dense_periods(periods, window)
+        self.resync = resync if resync is not None else window
+        omega = 2 * np.pi / self.periods
+        self._lags = np.exp(1j * np.outer(np.arange(window), omega))
+        self._rotate = np.exp(1j * omega)
+        self._oldest = self._lags[-1]
+        self._dc = self._lags.sum(axis=0)
+        self.buffer = np.zeros(window)
+        self.terms = np.zeros(len(self.periods), dtype=complex)
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.pos = 0
+        self.count = 0
+        self._since_sync = 0
+
+    @property
+    def ready(self):
+        return self.count >= self.window
+
+    # terms[j] = sum over the window of x[t - m] * exp(1j * omega_j * m), newest sample at m = 0
+    def _sync(self):
+        ordered = np.roll(self.buffer, -self.pos)[::-1]
+        self.terms = ordered @ self._lags
+        self.total = ordered.sum()
+        self.total_squares = ordered @ ordered
+        self._since_sync = 0
+
+    # Returns the current dominant-cycle estimate (None during warm-up)
+    def update(self, value):
+        value = 0.0 if np.isnan(value) else float(value)
+        old = self.buffer[self.pos]
+        self.buffer[self.pos] = value
+        self.pos = (self.pos + 1) % self.window
+        self.count += 1
+
+        self._since_sync += 1
+        if self._since_sync >= self.resync or self.count == self.window:
+            self._sync()
+        else:
+            self.terms = value + self._rotate * (self.terms - old * self._oldest)
+            self.total += value - old
+            self.total_squares += value * value - old * old
+
+        if not self.ready:
+            return None
+        mean = self.total / self.window
+        power = np.abs(self.terms - mean * self._dc) ** 2
+        variance = max(self.total_squares / self.window - mean * mean, 0.0)
+        return _best_period(self.periods, power, variance, self.window)
@@ -1,13 +1,16 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from scipy.fft import fft, ifft
-from scipy.signal import find_peaks
-import yfinance as yf
+from spectral import high_amplitude_series
+from peaks import label_peaks
+from market_data import download
+from wyckoff import wyckoff_method
+from results_store import append_results
+from reporting import PLOTTING, show
 
 # Download historical data
 symbol = 'CL=F'  # Crude Oil Futures
-data = yf.download(symbol, start="2020-01-01", end="2024-01-01", interval="1d")
+data = download(symbol, start="2020-01-01", end="2024-01-01", interval="1d")
 
 # Calculate moving averages
 data['50_MA'] = data['Close'].rolling(window=50).mean()
@@ -24,18 +27,9 @@ data = volume_oscillator(data)
 
 # Fourier Transform on Volume Oscillator
 volume_oscillator = data['Vol_Osc'].fillna(0).to_numpy(dtype=float)
-fft_values = fft(volume_oscillator)
-frequencies = np.fft.fftfreq(len(fft_values))
 
-# Identify high amplitude frequencies
-amplitudes = np.abs(fft_values)
-threshold = np.percentile(amplitudes, 90)
-high_amp_indices = np.where(amplitudes > threshold)[0]
-
-# Map to Time Domain
-significant_time_series = np.zeros_like(volume_oscillator, dtype=float)
-for idx in high_amp_indices:
-    significant_time_series += np.real(ifft(fft_values * (np.arange(len(fft_values)) == idx)))
+# Map to Time Domain (top 10% of amplitudes)
+significant_time_series = high_amplitude_series(volume_oscillator, percentile=90)
 
 # Generate Trading Signals
 high_amplitude_threshold = np.percentile(significant_time_series, 90)
@@ -44,51 +38,22 @@ data['Signal'] = np.where(
     np.where((significant_time_series < -high_amplitude_threshold) & (data['Close'] < data['Close'].rolling(20).mean()), 'Sell', None)
 )
 
-# Apply Wyckoff Method logic
-def wyckoff_method(data):
-    for i in range(len(data)):
-        if data['50_MA'].iloc[i] > data['200_MA'].iloc[i]:
-            if data['Close'].iloc[i] < data['50_MA'].iloc[i] and data['Close'].iloc[i] > data['200_MA'].iloc[i]:
-                data.loc[data.index[i], 'Phase'] = 'Distribution'
-            elif data['Close'].iloc[i] > data['50_MA'].iloc[i]:
-                data.loc[data.index[i], 'Phase'] = 'Markup'
-            elif data['Close'].iloc[i] < data['200_MA'].iloc[i]:
-                data.loc[data.index[i], 'Phase'] = 'Markdown'
-        elif data['50_MA'].iloc[i] < data['200_MA'].iloc[i]:
-            if data['Close'].iloc[i] < data['50_MA'].iloc[i] and data['Close'].iloc[i] > data['200_MA'].iloc[i]:
-                data.loc[data.index[i], 'Phase'] = 'Accumulation'
-            elif data['Close'].iloc[i] > data['50_MA'].iloc[i]:
-                data.loc[data.index[i], 'Phase'] = 'Markup'
-            elif data['Close'].iloc[i] < data['200_MA'].iloc[i]:
-                data.loc[data.index[i], 'Phase'] = 'Markdown'
-    return data
-
 data = wyckoff_method(data)
 
 # Peak Detection
-data['VolOsc_Peak'] = np.nan
-data['Price_Movement'] = np.nan
-
-peaks_top, _ = find_peaks(data['Vol_Osc'], distance=10)
-peaks_bottom, _ = find_peaks(-data['Vol_Osc'], distance=10)
-
-peaks_top_indices = data.index[peaks_top]
-peaks_bottom_indices = data.index[peaks_bottom]
-
-data.loc[peaks_top_indices, 'VolOsc_Peak'] = 'Top'
-data.loc[peaks_bottom_indices, 'VolOsc_Peak'] = 'Bottom'
-
-data.loc[peaks_bottom_indices, 'Price_Movement'] = data['Close'].shift(-1).loc[peaks_bottom_indices].sub(data['Close'].loc[peaks_bottom_indices]).apply(lambda x: 'Up' if x > 0 else 'Down')
-data.loc[peaks_top_indices, 'Price_Movement'] = data['Close'].shift(-1).loc[peaks_top_indices].sub(data['Close'].loc[peaks_top_indices]).apply(lambda x: 'Down' if x < 0 else 'Up')
+data = label_peaks(data, column='Vol_Osc', price='Close', distance=10)
+peaks_top_indices = data.index[data['VolOsc_Peak'] == 'Top']
+peaks_bottom_indices = data.index[data['VolOsc_Peak'] == 'Bottom']
 
 # Save data to CSV
-data.to_csv('trading_signals_with_fourier_and_wyckoff.csv')
+append_results(data, 'trading_signals_with_fourier_and_wyckoff', symbol)
 
 # Plotting
-plt.figure(figsize=(14, 7))
-plt.plot(data.index, data['Vol_Osc'], label='Volume Oscillator', color='gray')
-plt.scatter(peaks_top_indices, data['Vol_Osc'][peaks_top_indices], color='red', label='Top Peaks')
-plt.scatter(peaks_bottom_indices, data['Vol_Osc'][peaks_bottom_indices], color='blue', label='Bottom Peaks')
-plt.title('Volume Oscillator with Peak Detection and Fourier Analysis')
-plt.legend()
-plt.show()
+if PLOTTING:
+    plt.figure(figsize=(14, 7))
+    plt.plot(data.index, data['Vol_Osc'], label='Volume Oscillator', color='gray')
+    plt.scatter(peaks_top_indices, data['Vol_Osc'][peaks_top_indices], color='red', label='Top Peaks')
+    plt.scatter(peaks_bottom_indices, data['Vol_Osc'][peaks_bottom_indices], color='blue', label='Bottom Peaks')
+    plt.title('Volume Oscillator with Peak Detection and Fourier Analysis')
+    plt.legend()
+    show()
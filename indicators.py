@@ -0,0 +1,58 @@
+import numpy as np
+
+
+# Trailing means for several windows down the first axis (a 1-D series or a time x symbol panel), from
+# a single cumulative sum; returns {window: means}. A mean is NaN wherever its window holds a NaN, the same
+# as DataFrame.rolling(window).mean() column by column (warm-up, late listings, gaps).
+def rolling_means(values, windows):
+    values = np.asarray(values, dtype=float)
+    missing = np.isnan(values)
+    has_missing = missing.any()
+    n = values.shape[0]
+    csum = np.zeros((n + 1,) + values.shape[1:])
+    np.cumsum(np.where(missing, 0.0, values) if has_missing else values, axis=0, out=csum[1:])
+    if has_missing:
+        cmissing = np.zeros((n + 1,) + values.shape[1:], dtype=np.int32)
+        np.cumsum(missing, axis=0, out=cmissing[1:])
+
+    means = {}
+    for window in windows:
+        mean = np.empty(values.shape)
+        mean[:window - 1] = np.nan
+        if window <= n:
+            tail = mean[window - 1:]
+            np.subtract(csum[window:], csum[:n - window + 1], out=tail)
+            tail /= window
+            if has_missing:
+                tail[cmissing[window:] != cmissing[:n - window + 1]] = np.nan
+        means[window] = mean
+    return means
+
+
+# Calculate moving averages
+def moving_averages(data, windows=(50, 200)):
+    for window in windows:
+        data[f'{window}_MA'] = data['Close'].rolling(window=window).mean()
+    return data
+
+
+# Volume Oscillator Calculation
+def volume_oscillator(data, short_period=14, long_period=28):
+    data['Short_Vol_MA'] = data['Volume'].rolling(window=short_period).mean()
+    data['Long_Vol_MA'] = data['Volume'].rolling(window=long_period).mean()
+    data['Vol_Osc'] = ((data['Short_Vol_MA'] - data['Long_Vol_MA']) / data['Long_Vol_MA']) * 100
+    return data
+
+
+# Oscillator as the NaN-free float array the FFT steps expect
+def oscillator_array(data, column='Vol_Osc'):
+    return data[column].fillna(0).to_numpy(dtype=float)
+
+
+# Normalized volume oscillator (10/50 variant from volumeOscillation_deterministicApproach.py)
+def normalized_volume_oscillator(data, short_window=10, long_window=50):
+    long_mean = data['Volume'].rolling(window=long_window).mean()
+    data['VolOsc'] = data['Volume'].rolling(window=short_window).mean() - long_mean
+    data['VolOscNorm'] = data['VolOsc'] / long_mean
+    return data
+
@@ -0,0 +1,87 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import resource
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+# Current resident set size; falls back to the peak RSS where /proc is not available
+def rss_bytes():
+    try:
+        with open('/proc/self/statm') as handle:
+            return int(handle.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# Collects one record per named stage: wall time, CPU time, rows processed and RSS delta,
+# plus optional cProfile top functions and tracemalloc peak. Records are plain dicts so they
+# pickle across process pools and serialize straight to JSON lines.
+class StageRecorder:
+    def __init__(self, run_id=None, profile=False, trace_memory=False, profile_top=15, **fields):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.profile_top = profile_top
+        self.fields = fields
+        self.records = []
+
+    @contextmanager
+    def stage(self, name, rows=None, **fields):
+        record = {'run_id': self.run_id, 'stage': name, 'rows': rows, **self.fields, **fields}
+        profiler = cProfile.Profile() if self.profile else None
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        rss_before = rss_bytes()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            record['wall_seconds'] = time.perf_counter() - wall_start
+            record['cpu_seconds'] = time.process_time() - cpu_start
+            record['memory_delta_bytes'] = rss_bytes() - rss_before
+            if self.trace_memory:
+                record['traced_peak_bytes'] = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+            if profiler is not None:
+                stream = io.StringIO()
+                pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(self.profile_top)
+                record['profile'] = stream.getvalue()
+            record['timestamp'] = time.time()
+            self.records.append(record)
+
+    def extend(self, records):
+        self.records.extend(records)
+
+    # Append the records as JSON lines (one object per stage) for trend tracking across runs
+    def write_jsonl(self, path):
+        with open(path, 'a') as handle:
+            for record in self.records:
+                handle.write(json.dumps(record, default=str) + '\n')
+
+    # Totals per stage name, slowest first
+    def summary(self):
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record['stage'], {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                                                         'rows': 0})
+            total['calls'] += 1
+            total['wall_seconds'] += record['wall_seconds']
+            total['cpu_seconds'] += record['cpu_seconds']
+            total['rows'] += record['rows'] or 0
+        return dict(sorted(totals.items(), key=lambda item: -item[1]['wall_seconds']))
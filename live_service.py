@@ -0,0 +1,253 @@
+import argparse
+import asyncio
+import bisect
+import json
+import math
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from spectral import SlidingSpectrum
+from streaming import IndicatorEngine
+
+
+# Trailing window of values kept sorted, so a percentile costs one bisect insert/remove per bar
+class RollingPercentile:
+    def __init__(self, window, percentile=90):
+        self.window = window
+        self.percentile = percentile
+        self.values = deque()
+        self.ordered = []
+
+    def update(self, value):
+        self.values.append(value)
+        bisect.insort(self.ordered, value)
+        if len(self.values) > self.window:
+            self.ordered.pop(bisect.bisect_left(self.ordered, self.values.popleft()))
+        # Linear interpolation, same as np.percentile
+        position = (len(self.ordered) - 1) * self.percentile / 100
+        lower = math.floor(position)
+        upper = min(lower + 1, len(self.ordered) - 1)
+        return self.ordered[lower] + (self.ordered[upper] - self.ordered[lower]) * (position - lower)
+
+
+# Per-symbol incremental state: MAs, volume oscillator and Wyckoff phase from IndicatorEngine,
+# the causal high-amplitude band from SlidingSpectrum, and the signals.py rule with the percentile
+# taken over a trailing window instead of the whole (future-including) history
+class SymbolState:
+    def __init__(self, fft_window=256, fft_hop=1, fft_percentile=90, signal_percentile=90, threshold_window=500,
+                 **engine_options):
+        self.engine = IndicatorEngine(**engine_options)
+        self.spectrum = SlidingSpectrum(fft_window, hop=fft_hop, percentile=fft_percentile)
+        self.threshold = RollingPercentile(threshold_window, signal_percentile)
+        self.signal = None
+
+    # Returns (signal, indicators) where signal is 'Buy', 'Sell' or None for this bar
+    def update(self, close, volume):
+        indicators = self.engine.update(close, volume)
+        significant = self.spectrum.update(indicators['Vol_Osc'])
+        indicators['Significant'] = significant
+        if math.isnan(significant):
+            return None, indicators
+        threshold = self.threshold.update(significant)
+        if significant > threshold and indicators['Phase'] == 'Markup':
+            return 'Buy', indicators
+        if significant < -threshold and indicators['Phase'] == 'Markdown':
+            return 'Sell', indicators
+        return None, indicators
+
+
+# Replays OHLCV frames as one bar stream, interleaved by timestamp across symbols.
+# delay (seconds between bars) simulates a live feed; None replays as fast as possible.
+class ReplaySource:
+    def __init__(self, frames, delay=None):
+        self.frames = frames
+        self.delay = delay
+
+    @classmethod
+    def from_files(cls, paths, delay=None):
+        frames = {}
+        for symbol, path in paths.items():
+            if str(path).endswith('.parquet'):
+                frames[symbol] = pd.read_parquet(path)
+            else:
+                frames[symbol] = pd.read_csv(path, index_col=0, parse_dates=True)
+        return cls(frames, delay=delay)
+
+    async def __aiter__(self):
+        stream = pd.concat({symbol: frame[['Close', 'Volume']] for symbol, frame in self.frames.items()},
+                           names=['Symbol'])
+        stream = stream.reset_index(level='Symbol').sort_index(kind='stable')
+        for timestamp, symbol, close, volume in zip(stream.index, stream['Symbol'],
+                                                    stream['Close'].to_numpy(float).tolist(),
+                                                    stream['Volume'].to_numpy(float).tolist()):
+            yield {'symbol': symbol, 'timestamp': timestamp, 'close': close, 'volume': volume}
+            await asyncio.sleep(self.delay or 0)
+
+
+# Reads bars written as JSON lines ({"symbol", "timestamp", "close", "volume"}); with follow=True
+# it keeps tailing the file like a live feed
+class JsonLinesSource:
+    def __init__(self, path, follow=False, poll=0.5):
+        self.path = path
+        self.follow = follow
+        self.poll = poll
+
+    async def __aiter__(self):
+        with open(self.path) as handle:
+            while True:
+                line = handle.readline()
+                if not line:
+                    if not self.follow:
+                        return
+                    await asyncio.sleep(self.poll)
+                    continue
+                if line.strip():
+                    yield json.loads(line)
+
+
+# Collects events in memory
+class ListSink:
+    def __init__(self):
+        self.events = []
+
+    async def publish(self, event):
+        self.events.append(event)
+
+
+# Appends one JSON object per event, flushed so readers see events as they happen
+class JsonLinesSink:
+    def __init__(self, path):
+        self.path = path
+        self._handle = None
+
+    async def publish(self, event):
+        if self._handle is None:
+            self._handle = open(self.path, 'a')
+        self._handle.write(json.dumps(event, default=str) + '\n')
+        self._handle.flush()
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+# Long-running signal service: consumes a bar source for any number of symbols, updates each
+# symbol's state in O(1)/O(window) per bar and publishes an event whenever a symbol's signal changes
+# to Buy or Sell. Events go through a bounded queue to the sink so a slow sink applies backpressure
+# instead of growing memory. Any object with an async publish(event) method can be a sink.
+class SignalService:
+    def __init__(self, sink, queue_size=1000, latency_samples=100_000, **state_options):
+        self.sink = sink
+        self.queue_size = queue_size
+        self.state_options = state_options
+        self.states = {}
+        self.latencies_ns = deque(maxlen=latency_samples)
+        self.bars = 0
+
+    def _state(self, symbol):
+        state = self.states.get(symbol)
+        if state is None:
+            state = self.states[symbol] = SymbolState(**self.state_options)
+        return state
+
+    # Process one bar synchronously; returns the event to publish or None
+    def on_bar(self, bar):
+        start = time.perf_counter_ns()
+        state = self._state(bar['symbol'])
+        signal, indicators = state.update(bar['close'], bar['volume'])
+        event = None
+        if signal != state.signal:
+            state.signal = signal
+            if signal is not None:
+                event = {
+                    'symbol': bar['symbol'],
+                    'timestamp': bar['timestamp'],
+                    'signal': signal,
+                    'close': bar['close'],
+                    'phase': indicators['Phase'],
+                    'vol_osc': indicators['Vol_Osc'],
+                    'significant': indicators['Significant'],
+                }
+        latency = time.perf_counter_ns() - start
+        self.latencies_ns.append(latency)
+        self.bars += 1
+        if event is not None:
+            event['latency_us'] = latency / 1000
+        return event
+
+    async def _publish(self, queue):
+        while True:
+            event = await queue.get()
+            if event is None:
+                return
+            await self.sink.publish(event)
+
+    # Queue an event without ever blocking on a dead publisher: if the sink raised, its exception
+    # is re-raised here instead of put() waiting forever on a queue nobody drains
+    async def _put(self, queue, publisher, event):
+        if publisher.done():
+            publisher.result()
+            raise RuntimeError('event publisher stopped')
+        if not queue.full():
+            queue.put_nowait(event)
+            return
+        put = asyncio.ensure_future(queue.put(event))
+        await asyncio.wait({put, publisher}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            publisher.result()
+            raise RuntimeError('event publisher stopped')
+
+    async def run(self, source):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        publisher = asyncio.create_task(self._publish(queue))
+        try:
+            async for bar in source:
+                event = self.on_bar(bar)
+                if event is not None:
+                    await self._put(queue, publisher, event)
+            await self._put(queue, publisher, None)
+            await publisher
+        finally:
+            publisher.cancel()
+        return self.stats()
+
+    # Per-bar processing latency in microseconds over the most recent latency_samples bars
+    def stats(self):
+        latencies = np.asarray(self.latencies_ns, dtype=float) / 1000
+        if not len(latencies):
+            return {'bars': 0, 'symbols': len(self.states)}
+        return {
+            'bars': self.bars,
+            'symbols': len(self.states),
+            'p50_us': float(np.percentile(latencies, 50)),
+            'p99_us': float(np.percentile(latencies, 99)),
+            'max_us': float(latencies.max()),
+        }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay bars through the live signal service')
+    parser.add_argument('files', nargs='*', help='SYMBOL=path.parquet|path.csv OHLCV files to replay')
+    parser.add_argument('--jsonl', default=None, help='read bars from this JSON lines file instead')
+    parser.add_argument('--follow', action='store_true', help='keep tailing the --jsonl file')
+    parser.add_argument('--delay', type=float, default=None, help='seconds between replayed bars')
+    parser.add_argument('--events', default='signal_events.jsonl')
+    parser.add_argument('--fft-window', type=int, default=256)
+    parser.add_argument('--fft-hop', type=int, default=1, help='re-select FFT bins every N bars per symbol')
+    args = parser.parse_args()
+
+    if args.jsonl:
+        source = JsonLinesSource(args.jsonl, follow=args.follow)
+    else:
+        source = ReplaySource.from_files(dict(item.split('=', 1) for item in args.files), delay=args.delay)
+    sink = JsonLinesSink(args.events)
+    try:
+        stats = asyncio.run(SignalService(sink, fft_window=args.fft_window, fft_hop=args.fft_hop).run(source))
+    finally:
+        sink.close()
+    print(stats)
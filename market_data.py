@@ -0,0 +1,199 @@
+import json
+import os
+import re
+
+import pandas as pd
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+DEFAULT_CACHE_DIR = os.environ.get('MARKET_DATA_CACHE', '.market_data_cache')
+# MARKET_DATA_OFFLINE=1 makes download() serve the cache only (e.g. `MARKET_DATA_OFFLINE=1 python volume_wycoff.py`)
+OFFLINE = os.environ.get('MARKET_DATA_OFFLINE', '') not in ('', '0')
+
+_PERIOD_UNITS = {'d': 'days', 'wk': 'weeks', 'mo': 'months', 'y': 'years'}
+
+
+# Turn a yfinance style period ("3mo", "5d", "1y") into a DateOffset
+def period_offset(period):
+    match = re.fullmatch(r'(\d+)(d|wk|mo|y)', period)
+    if match is None:
+        raise ValueError(f"Unsupported period: {period!r}")
+    return pd.DateOffset(**{_PERIOD_UNITS[match.group(2)]: int(match.group(1))})
+
+
+# Parse a start/end bound so it can be compared with the (possibly tz-aware) index
+def _as_timestamp(value, tz):
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    if tz is not None and ts.tzinfo is None:
+        return ts.tz_localize(tz)
+    if tz is None and ts.tzinfo is not None:
+        return ts.tz_convert(None)
+    return ts
+
+
+# Keep only the OHLCV columns with a sorted, de-duplicated DatetimeIndex
+def _normalize(frame):
+    if isinstance(frame.columns, pd.MultiIndex):
+        frame = frame.copy()
+        frame.columns = frame.columns.get_level_values(0)
+    frame = frame[[col for col in OHLCV_COLUMNS if col in frame.columns]]
+    if not isinstance(frame.index, pd.DatetimeIndex):
+        frame.index = pd.to_datetime(frame.index, utc=True)
+    frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+    if frame.index.name is None:
+        frame.index.name = 'Datetime'
+    return frame
+
+
+# Live provider backed by yfinance
+class YahooProvider:
+    def __call__(self, symbol, interval, start=None, end=None, period=None):
+        import yfinance as yf
+
+        if start is None and period is None:
+            period = 'max'
+        return yf.download(symbol, start=start, end=end, period=period, interval=interval,
+                           auto_adjust=False, progress=False)
+
+
+# Local stand-in that replays checked-in CSVs (e.g. wyckoff_analysis.csv) for tests and air-gapped machines
+class CsvReplayProvider:
+    def __init__(self, files):
+        # files maps symbol -> CSV path, or is a single path used for every symbol
+        self.files = files
+        self._frames = {}
+
+    def _frame(self, symbol):
+        path = self.files if isinstance(self.files, (str, os.PathLike)) else self.files[symbol]
+        if path not in self._frames:
+            self._frames[path] = _normalize(pd.read_csv(path, index_col=0))
+        return self._frames[path]
+
+    def __call__(self, symbol, interval, start=None, end=None, period=None):
+        return _window(self._frame(symbol), start=start, end=end, period=period)
+
+
+# OHLCV cache keyed by (symbol, interval), one Parquet file per key. Next to it, <symbol>.json
+# records the time range the cache has already fetched ({"start", "end"}, ISO or null for "from the
+# first bar"), so requests inside that range are served without going back to the provider.
+class MarketDataCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, provider=None):
+        self.cache_dir = cache_dir
+        self.provider = provider if provider is not None else YahooProvider()
+
+    def path(self, symbol, interval):
+        safe_symbol = re.sub(r'[^A-Za-z0-9_.-]', '_', symbol)
+        return os.path.join(self.cache_dir, interval, f'{safe_symbol}.parquet')
+
+    def load(self, symbol, interval):
+        path = self.path(symbol, interval)
+        if not os.path.exists(path):
+            return None
+        return pd.read_parquet(path)
+
+    # Covered (start, end) timestamps; without a record the cached bars themselves are the range
+    def coverage(self, symbol, interval, cached):
+        path = self._coverage_path(symbol, interval)
+        if not os.path.exists(path):
+            return cached.index[0], cached.index[-1]
+        with open(path) as handle:
+            covered = json.load(handle)
+        tz = cached.index.tz
+        return _as_timestamp(covered['start'], tz), _as_timestamp(covered['end'], tz)
+
+    def _coverage_path(self, symbol, interval):
+        return os.path.splitext(self.path(symbol, interval))[0] + '.json'
+
+    def store(self, symbol, interval, frame, coverage=None):
+        path = self.path(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        frame.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+        if coverage is not None:
+            start, end = coverage
+            path = self._coverage_path(symbol, interval)
+            with open(path + '.tmp', 'w') as handle:
+                json.dump({'start': None if start is None else start.isoformat(), 'end': end.isoformat()}, handle)
+            os.replace(path + '.tmp', path)
+
+    def _fetch(self, symbol, interval, **kwargs):
+        return _normalize(self.provider(symbol, interval, **kwargs))
+
+    # Bring the cache up to date and return the requested window. Only what the cache has not covered
+    # yet is fetched: earlier bars are backfilled once, and the tail from the last cached bar is
+    # re-fetched only when the request reaches past the covered end (an open end always does, so a
+    # partial last bar gets revised).
+    def download(self, symbol, period=None, interval='1d', start=None, end=None, offline=False):
+        cached = self.load(symbol, interval)
+
+        if not offline:
+            now = pd.Timestamp.now(tz='UTC')
+            if cached is None or cached.empty:
+                merged = self._fetch(symbol, interval, start=start, end=end, period=period)
+                fetched = True
+                start_ts, end_ts = _request_bounds(merged.index.tz, start, end, period, now)
+                covered_start = start_ts
+                covered_end = _as_timestamp(now, merged.index.tz) if end_ts is None else end_ts
+            else:
+                tz = cached.index.tz
+                start_ts, end_ts = _request_bounds(tz, start, end, period, now)
+                covered_start, covered_end = self.coverage(symbol, interval, cached)
+                parts = [cached]
+                # covered_start None: the cache already starts at the provider's first bar
+                if covered_start is not None and (start_ts is None or start_ts < covered_start):
+                    parts.insert(0, self._fetch(symbol, interval, start=start_ts, end=cached.index[0]))
+                    covered_start = start_ts
+                if end_ts is None or end_ts > covered_end:
+                    # Re-fetch from the last cached bar so a partial bar gets revised
+                    parts.append(self._fetch(symbol, interval, start=cached.index[-1], end=end_ts))
+                    covered_end = _as_timestamp(now, tz) if end_ts is None else end_ts
+                fetched = len(parts) > 1
+                merged = _normalize(pd.concat(parts)) if fetched else cached
+            if fetched and not merged.empty:
+                self.store(symbol, interval, merged, coverage=(covered_start, covered_end))
+            cached = merged
+
+        if cached is None:
+            raise LookupError(f"No cached data for {symbol} ({interval})")
+        return _window(cached, start=start, end=end, period=period)
+
+
+# Requested [start, end) as timestamps in the cache's timezone; start None means "from the first
+# bar" (period 'max' or no bounds), end None means "up to now"
+def _request_bounds(tz, start, end, period, now):
+    start_ts = _as_timestamp(start, tz)
+    if start_ts is None and period not in (None, 'max'):
+        start_ts = _as_timestamp(now, tz) - period_offset(period)
+    return start_ts, _as_timestamp(end, tz)
+
+
+# Slice a cached frame to [start, end) or to the trailing period
+def _window(frame, start=None, end=None, period=None):
+    if frame.empty:
+        return frame
+    tz = frame.index.tz
+    if period not in (None, 'max') and start is None:
+        start = frame.index[-1] - period_offset(period)
+    start, end = _as_timestamp(start, tz), _as_timestamp(end, tz)
+    if start is not None:
+        frame = frame[frame.index >= start]
+    if end is not None:
+        frame = frame[frame.index < end]
+    return frame.copy()
+
+
+_default_cache = None
+
+
+# Cached drop-in for download(symbol, period=..., interval=...) / (start=..., end=...).
+# offline defaults to the MARKET_DATA_OFFLINE environment switch.
+def download(symbol, period=None, interval='1d', start=None, end=None, offline=None, cache=None):
+    global _default_cache
+    offline = OFFLINE if offline is None else offline
+    if cache is None:
+        if _default_cache is None:
+            _default_cache = MarketDataCache()
+        cache = _default_cache
+    return cache.download(symbol, period=period, interval=interval, start=start, end=end, offline=offline)
@@ -0,0 +1,155 @@
+import math
+
+import numpy as np
+from scipy.signal import lfilter
+
+
+# Weight of the first observation after `gap` missing bars in Series.ewm(adjust=False, ignore_na=False):
+# the old value's weight keeps decaying through the gap. pandas takes a different branch when
+# com == 1 (alpha 0.5); it is mirrored so results match exactly. gap=0 gives plain alpha.
+def _gap_weight(alpha, gap):
+    decay = (1.0 - alpha) ** (gap + 1)
+    if alpha == 0.5:
+        return 1.0 - decay
+    return alpha / (decay + alpha)
+
+
+# EMA of one series that has NaNs after its first valid value: each run of valid bars is one
+# lfilter call, restarted across a gap with _gap_weight; the value is held through the gap
+def _ema_with_gaps(values, alpha):
+    smoothed = np.full(len(values), np.nan)
+    bars = np.flatnonzero(~np.isnan(values))
+    runs = np.split(bars, np.flatnonzero(np.diff(bars) > 1) + 1)
+    previous, previous_end = None, None
+    for run in runs:
+        start, stop = run[0], run[-1] + 1
+        if previous is None:
+            first = values[start]
+        else:
+            first = previous + _gap_weight(alpha, start - previous_end - 1) * (values[start] - previous)
+            smoothed[previous_end + 1:start] = previous
+        smoothed[start] = first
+        if stop > start + 1:
+            smoothed[start + 1:stop], _ = lfilter([alpha], [1.0, alpha - 1.0], values[start + 1:stop],
+                                                  zi=[(1.0 - alpha) * first])
+        previous, previous_end = smoothed[stop - 1], stop - 1
+    smoothed[previous_end + 1:] = previous
+    return smoothed
+
+
+# Recursive EMA y[t] = alpha * x[t] + (1 - alpha) * y[t-1] along `axis`, the same as
+# Series.ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean() per series: seeded with the
+# first valid value, held through NaN gaps and resumed with pandas' ignore_na=False weighting, and
+# NaN until min_periods observations. Gap-free series (after their own leading NaNs) go through
+# one batched lfilter call in C; series with gaps are filtered run by run.
+def ema(values, alpha, min_periods=1, axis=-1):
+    values = np.moveaxis(np.asarray(values, dtype=float), axis, -1)
+    shape = values.shape
+    values = values.reshape(-1, shape[-1])
+    valid = ~np.isnan(values)
+    bars = np.arange(shape[-1])
+    first = np.where(valid.any(axis=-1), valid.argmax(axis=-1), shape[-1])
+    seed = np.take_along_axis(values, np.minimum(first, shape[-1] - 1)[:, None], axis=-1)
+    filled = np.where(bars < first[:, None], seed, values)
+    gaps = np.isnan(filled).any(axis=-1) & valid.any(axis=-1)
+
+    smoothed = np.empty(values.shape)
+    clean = ~gaps
+    if clean.any():
+        smoothed[clean], _ = lfilter([alpha], [1.0, alpha - 1.0], filled[clean], axis=-1,
+                                     zi=(1.0 - alpha) * seed[clean])
+    for row in np.flatnonzero(gaps):
+        smoothed[row] = _ema_with_gaps(values[row], alpha)
+    smoothed[np.cumsum(valid, axis=-1) < min_periods] = np.nan
+    return np.moveaxis(smoothed.reshape(shape), -1, axis)
+
+
+# Wilder RSI (alpha = 1/window), matching ta.momentum.RSIIndicator(close, window).rsi() on gap-free
+# closes. A missing close is a gap in both averages (see ema); the change after it is measured from
+# the last valid close, and each series' first close counts as a zero change.
+def rsi(close, window=14, axis=-1):
+    close = np.moveaxis(np.asarray(close, dtype=float), axis, -1)
+    bars = np.arange(close.shape[-1])
+    last_valid = np.maximum.accumulate(np.where(np.isnan(close), -1, bars), axis=-1)
+    previous_bar = np.full(close.shape, -1)
+    previous_bar[..., 1:] = last_valid[..., :-1]
+    previous = np.where(previous_bar >= 0, np.take_along_axis(close, np.maximum(previous_bar, 0), axis=-1), np.nan)
+    diff = np.where(np.isnan(previous), 0.0, close - previous)
+    diff[np.isnan(close)] = np.nan
+    up = ema(np.where(diff < 0, 0.0, diff), 1.0 / window, min_periods=window)
+    down = ema(np.where(diff > 0, 0.0, -diff), 1.0 / window, min_periods=window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.where(down == 0, 100.0, 100.0 - 100.0 / (1.0 + up / down))
+    return np.moveaxis(values, -1, axis)
+
+
+# MACD line, signal line and histogram, matching ta.trend.MACD(close) (spans 12/26/9, adjust=False)
+def macd(close, fast=12, slow=26, signal=9, axis=-1):
+    line = (ema(close, 2.0 / (fast + 1), min_periods=fast, axis=axis)
+            - ema(close, 2.0 / (slow + 1), min_periods=slow, axis=axis))
+    signal_line = ema(line, 2.0 / (signal + 1), min_periods=signal, axis=axis)
+    return line, signal_line, line - signal_line
+
+
+# The volume_wycoff.py rule as array predicates: oversold RSI with rising volume -> buy,
+# overbought RSI with falling volume -> sell. Works on any matching shapes (one symbol or a panel).
+def rsi_volume_rule(rsi_values, vol_osc, oversold=30, overbought=70):
+    buy = (rsi_values < oversold) & (vol_osc > 0)
+    sell = (rsi_values > overbought) & (vol_osc < 0)
+    return buy, sell
+
+
+# Streaming EMA with the same seeding, gap weighting and warm-up as ema()
+class EMAState:
+    def __init__(self, alpha, min_periods=1):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = math.nan
+        self.count = 0
+        self.gap = 0
+
+    def update(self, value):
+        if math.isnan(value):
+            if self.count:
+                self.gap += 1
+        else:
+            if self.count == 0:
+                self.value = value
+            else:
+                self.value += _gap_weight(self.alpha, self.gap) * (value - self.value)
+            self.gap = 0
+            self.count += 1
+        return self.value if self.count >= self.min_periods else math.nan
+
+
+# Streaming Wilder RSI; one update per close gives the same values as rsi()
+class RSIState:
+    def __init__(self, window=14):
+        self.up = EMAState(1.0 / window, min_periods=window)
+        self.down = EMAState(1.0 / window, min_periods=window)
+        self.previous = None
+
+    def update(self, close):
+        if math.isnan(close):
+            up, down = self.up.update(math.nan), self.down.update(math.nan)
+        else:
+            diff = 0.0 if self.previous is None else close - self.previous
+            self.previous = close
+            up = self.up.update(diff if diff > 0 else 0.0)
+            down = self.down.update(-diff if diff < 0 else 0.0)
+        if down == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + up / down)
+
+
+# Streaming MACD; update(close) returns (macd, signal, histogram) like macd()
+class MACDState:
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMAState(2.0 / (fast + 1), min_periods=fast)
+        self.slow = EMAState(2.0 / (slow + 1), min_periods=slow)
+        self.signal = EMAState(2.0 / (signal + 1), min_periods=signal)
+
+    def update(self, close):
+        line = self.fast.update(close) - self.slow.update(close)
+        signal_line = self.signal.update(line)
+        return line, signal_line, line - signal_line
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from indicators import rolling_means
+from wyckoff import phase_categorical, wyckoff_codes
+
+
+# Aligned (time x symbol) panel of one column from per-symbol frames; bars a symbol lacks are NaN
+def build_panel(frames, column):
+    return pd.concat({symbol: frame[column] for symbol, frame in frames.items()}, axis=1).sort_index()
+
+
+# MAs, volume oscillator (14/28), normalized volume oscillator (10/50) and Wyckoff phase codes for
+# every column of aligned Close and Volume panels. Each input gets one cumulative sum shared by all
+# of its windows. Returns {column name: (time x symbol) array}, with the names the per-symbol
+# functions in indicators.py / wyckoff.py use; Phase holds int8 codes into wyckoff.PHASES.
+def panel_indicators(close, volume, ma_windows=(50, 200), short_period=14, long_period=28,
+                     norm_short=10, norm_long=50):
+    close_means = rolling_means(close, ma_windows)
+    volume_means = rolling_means(volume, sorted({short_period, long_period, norm_short, norm_long}))
+
+    results = {f'{window}_MA': close_means[window] for window in ma_windows}
+    short, long = volume_means[short_period], volume_means[long_period]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        results['Short_Vol_MA'] = short
+        results['Long_Vol_MA'] = long
+        results['Vol_Osc'] = (short - long) / long * 100
+        results['VolOsc'] = volume_means[norm_short] - volume_means[norm_long]
+        results['VolOscNorm'] = results['VolOsc'] / volume_means[norm_long]
+    if len(ma_windows) >= 2:
+        results['Phase'] = wyckoff_codes(close, close_means[ma_windows[0]], close_means[ma_windows[1]])
+    return results
+
+
+# panel_indicators for DataFrame panels: returns {column name: DataFrame (time x symbol)}
+# with Phase as categorical labels
+def panel_indicator_frames(close, volume, **options):
+    volume = volume.reindex(index=close.index, columns=close.columns)
+    results = panel_indicators(close.to_numpy(dtype=float), volume.to_numpy(dtype=float), **options)
+    frames = {}
+    for name, values in results.items():
+        if name == 'Phase':
+            frames[name] = pd.DataFrame({symbol: phase_categorical(values[:, i], index=close.index)
+                                         for i, symbol in enumerate(close.columns)})
+        else:
+            frames[name] = pd.DataFrame(values, index=close.index, columns=close.columns)
+    return frames
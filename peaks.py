@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+from scipy.signal import find_peaks
+
+from wyckoff import PHASES
+
+TOP, BOTTOM, NONE = 1, -1, 0
+UP, DOWN = 1, -1
+
+
+# Peak type per bar for a symbols x time array: +1 top, -1 bottom, 0 neither
+def peak_types(values, distance=10):
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    types = np.zeros(values.shape, dtype=np.int8)
+    for row, series in enumerate(values):
+        tops, _ = find_peaks(series, distance=distance)
+        bottoms, _ = find_peaks(-series, distance=distance)
+        types[row, tops] = TOP
+        types[row, bottoms] = BOTTOM
+    return types
+
+
+# Close-to-close change over each horizon; NaN where the horizon runs past the end
+def forward_changes(close, horizons=(1, 5, 20)):
+    close = np.atleast_2d(np.asarray(close, dtype=float))
+    changes = np.full((len(horizons),) + close.shape, np.nan)
+    for h, horizon in enumerate(horizons):
+        changes[h, :, :-horizon] = close[:, horizon:] - close[:, :-horizon]
+    return changes
+
+
+# Direction after each peak, with the scripts' tie rule: a bottom is 'Up' only on a rise and a top
+# is 'Down' only on a fall. +1 up, -1 down, 0 not a peak or no forward price
+def movement_codes(types, changes):
+    up_after_bottom = (types == BOTTOM) & (changes > 0)
+    down_after_bottom = (types == BOTTOM) & (changes <= 0)
+    down_after_top = (types == TOP) & (changes < 0)
+    up_after_top = (types == TOP) & (changes >= 0)
+    return np.where(up_after_bottom | up_after_top, UP,
+                    np.where(down_after_bottom | down_after_top, DOWN, 0)).astype(np.int8)
+
+
+# Hit rate of "bottom -> up, top -> down" per horizon, peak type and (optionally) Wyckoff phase.
+# phase_codes uses wyckoff.PHASES indices with the same shape as types.
+def hit_rate_table(types, changes, horizons=(1, 5, 20), phase_codes=None):
+    types = np.atleast_2d(types)
+    if phase_codes is None:
+        phase_codes = np.full(types.shape, PHASES.index('Unknown'), dtype=np.int8)
+    phase_codes = np.atleast_2d(phase_codes)
+    moves = movement_codes(types[None], changes)
+    hits = ((types[None] == BOTTOM) & (moves == UP)) | ((types[None] == TOP) & (moves == DOWN))
+
+    n_phases = len(PHASES)
+    type_index = np.where(types == TOP, 0, 1)
+    key = type_index * n_phases + phase_codes
+    rows = []
+    for h, horizon in enumerate(horizons):
+        counted = (types != NONE) & (moves[h] != 0)
+        total = np.bincount(key[counted], minlength=2 * n_phases)
+        wins = np.bincount(key[counted & hits[h]], minlength=2 * n_phases)
+        for k in np.flatnonzero(total):
+            rows.append(('Top' if k < n_phases else 'Bottom', PHASES[k % n_phases], horizon,
+                         int(total[k]), wins[k] / total[k]))
+    table = pd.DataFrame(rows, columns=['Peak', 'Phase', 'Horizon', 'Count', 'Hit_Rate'])
+    return table.set_index(['Peak', 'Phase', 'Horizon']).sort_index()
+
+
+# Drop-in for the scripts' find_peaks + shift(-1).apply(lambda ...) block on one frame:
+# fills VolOsc_Peak ('Top'/'Bottom') and Price_Movement ('Up'/'Down') at the peaks
+def label_peaks(data, column='VolOscNorm', price='Adj Close', distance=10, horizon=1):
+    types = peak_types(data[column].to_numpy(dtype=float), distance=distance)[0]
+    changes = forward_changes(data[price].to_numpy(dtype=float), horizons=(horizon,))[0, 0]
+    moves = movement_codes(types, changes)
+    data['VolOsc_Peak'] = np.select([types == TOP, types == BOTTOM], ['Top', 'Bottom'], default=None)
+    data['Price_Movement'] = np.select([moves == UP, moves == DOWN], ['Up', 'Down'], default=None)
+    return data
@@ -0,0 +1,127 @@
+import argparse
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from indicators import moving_averages, oscillator_array, volume_oscillator
+from instrumentation import StageRecorder
+from market_data import DEFAULT_CACHE_DIR, MarketDataCache
+from signals import high_amplitude_wyckoff_signals
+from spectral import high_amplitude_series
+from wyckoff import wyckoff_method
+
+
+# MAs -> volume oscillator -> FFT band -> Wyckoff -> signals for one symbol's OHLCV frame,
+# each step timed as a named stage on `recorder`
+def analyze(data, short_period=14, long_period=28, fft_percentile=90, signal_percentile=90, recorder=None):
+    recorder = recorder if recorder is not None else StageRecorder()
+    rows = len(data)
+    with recorder.stage('moving_averages', rows):
+        data = moving_averages(data)
+    with recorder.stage('volume_oscillator', rows):
+        data = volume_oscillator(data, short_period=short_period, long_period=long_period)
+    with recorder.stage('fft_high_amplitude', rows):
+        significant_time_series = high_amplitude_series(oscillator_array(data), percentile=fft_percentile)
+        data['Significant'] = significant_time_series
+    with recorder.stage('wyckoff', rows):
+        data = wyckoff_method(data)
+    with recorder.stage('signals', rows):
+        data = high_amplitude_wyckoff_signals(data, significant_time_series, percentile=signal_percentile)
+    return data
+
+
+# Worker entry point; never raises so one bad symbol cannot take down the pool
+def run_symbol(symbol, period='3mo', interval='1h', cache_dir=DEFAULT_CACHE_DIR, provider=None, offline=False,
+               run_id=None, profile=False, trace_memory=False):
+    recorder = StageRecorder(run_id=run_id, profile=profile, trace_memory=trace_memory, symbol=symbol)
+    try:
+        cache = MarketDataCache(cache_dir, provider)
+        with recorder.stage('download') as record:
+            data = cache.download(symbol, period=period, interval=interval, offline=offline)
+            record['rows'] = len(data)
+        if data.empty:
+            raise LookupError(f"No data returned for {symbol}")
+        return symbol, analyze(data, recorder=recorder), None, recorder.records
+    except Exception:
+        return symbol, None, traceback.format_exc(), recorder.records
+
+
+def _run_symbol_args(args):
+    return run_symbol(*args)
+
+
+# Run the full analysis for every symbol across a process pool and write one combined result file
+# Per-stage records from every worker are gathered in report['stages'] (and appended to stage_log as JSON lines)
+def run_pipeline(symbols, workers=None, period='3mo', interval='1h', cache_dir=DEFAULT_CACHE_DIR,
+                 provider=None, offline=False, output='pipeline_results.parquet', stage_log=None,
+                 profile=False, trace_memory=False):
+    workers = workers or os.cpu_count()
+    recorder = StageRecorder(profile=profile, trace_memory=trace_memory)
+    jobs = [(symbol, period, interval, cache_dir, provider, offline, recorder.run_id, profile, trace_memory)
+            for symbol in symbols]
+
+    start = time.perf_counter()
+    results, failures = {}, {}
+    if workers == 1:
+        outcomes = map(_run_symbol_args, jobs)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        chunksize = max(1, len(jobs) // (workers * 4))
+        outcomes = executor.map(_run_symbol_args, jobs, chunksize=chunksize)
+    try:
+        for symbol, frame, error, records in outcomes:
+            recorder.extend(records)
+            if error is None:
+                results[symbol] = frame
+            else:
+                failures[symbol] = error
+    finally:
+        if workers != 1:
+            executor.shutdown()
+
+    if output and results:
+        with recorder.stage('write') as record:
+            combined = pd.concat(results, names=['Symbol'])
+            combined['Phase'] = combined['Phase'].astype('category')
+            combined.to_parquet(output)
+            record['rows'] = len(combined)
+    elapsed = time.perf_counter() - start
+    if stage_log:
+        recorder.write_jsonl(stage_log)
+
+    return {
+        'results': results,
+        'failures': failures,
+        'elapsed': elapsed,
+        'symbols_per_sec': len(symbols) / elapsed if elapsed else float('inf'),
+        'stages': recorder.records,
+        'stage_summary': recorder.summary(),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the Wyckoff/FFT analysis for many symbols in parallel')
+    parser.add_argument('symbols', nargs='+')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--period', default='3mo')
+    parser.add_argument('--interval', default='1h')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--offline', action='store_true')
+    parser.add_argument('--output', default='pipeline_results.parquet')
+    parser.add_argument('--stage-log', default=None, help='append per-stage timings here as JSON lines')
+    parser.add_argument('--profile', action='store_true', help='capture cProfile output per stage')
+    parser.add_argument('--trace-memory', action='store_true', help='capture tracemalloc peaks per stage')
+    args = parser.parse_args()
+
+    report = run_pipeline(args.symbols, workers=args.workers, period=args.period, interval=args.interval,
+                          cache_dir=args.cache_dir, offline=args.offline, output=args.output,
+                          stage_log=args.stage_log, profile=args.profile, trace_memory=args.trace_memory)
+    for symbol, error in report['failures'].items():
+        print(f"{symbol} failed:\n{error}")
+    for name, total in report['stage_summary'].items():
+        print(f"{name:>20}: {total['wall_seconds']:.3f}s wall, {total['cpu_seconds']:.3f}s cpu, {total['rows']} rows")
+    print(f"{len(report['results'])}/{len(args.symbols)} symbols in {report['elapsed']:.2f}s "
+          f"({report['symbols_per_sec']:.1f} symbols/sec)")
@@ -0,0 +1,144 @@
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import numpy as np
+
+# PLOT_MODE=show (interactive, the old behaviour) | save (render off-screen to PLOT_DIR) | off (skip)
+PLOT_MODE = os.environ.get('PLOT_MODE', 'show')
+PLOT_DIR = os.environ.get('PLOT_DIR', 'plots')
+# Scripts wrap each figure in `if PLOTTING:` so PLOT_MODE=off never builds the figures at all
+PLOTTING = PLOT_MODE != 'off'
+if PLOT_MODE != 'show':
+    matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+PHASE_COLORS = {'Accumulation': 'darkblue', 'Markup': 'darkgreen', 'Distribution': 'darkred', 'Markdown': 'purple'}
+SIGNAL_COLORS = {'Buy': 'green', 'Sell': 'red'}
+
+_figure_numbers = itertools.count(1)
+
+
+# Drop-in for plt.show(): shows, or saves to PLOT_DIR/<script>_<n>.png; with PLOT_MODE=off it only
+# closes a figure built outside an `if PLOTTING:` block
+def show(name=None):
+    if PLOT_MODE == 'show':
+        plt.show()
+        return
+    figure = plt.gcf()
+    if PLOT_MODE == 'save':
+        script = os.path.splitext(os.path.basename(sys.argv[0]))[0] or 'figure'
+        name = name or f'{script}_{next(_figure_numbers)}'
+        os.makedirs(PLOT_DIR, exist_ok=True)
+        figure.savefig(os.path.join(PLOT_DIR, f'{name}.png'))
+    plt.close(figure)
+
+
+# Indices of the min and max of each of n_bins buckets, in time order (keeps every spike visible)
+def minmax_indices(values, n_bins):
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n <= 2 * n_bins:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_bins + 1).astype(int)
+    filled = np.where(np.isnan(values), np.nanmean(values), values)
+    lows = [edges[b] + np.argmin(filled[edges[b]:edges[b + 1]]) for b in range(n_bins)]
+    highs = [edges[b] + np.argmax(filled[edges[b]:edges[b + 1]]) for b in range(n_bins)]
+    return np.unique(np.concatenate([lows, highs, [0, n - 1]]))
+
+
+# Largest-Triangle-Three-Buckets: n_out indices that preserve the visual shape of the series
+def lttb_indices(x, y, n_out):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = [0]
+    for b in range(n_out - 2):
+        start, stop = edges[b], edges[b + 1]
+        next_stop = edges[b + 2] if b + 2 < len(edges) else n
+        next_x, next_y = x[stop:next_stop].mean(), np.nanmean(y[stop:next_stop])
+        prev = selected[-1]
+        area = np.abs((x[prev] - next_x) * (y[start:stop] - y[prev])
+                      - (x[prev] - x[start:stop]) * (next_y - y[prev]))
+        selected.append(start + int(np.nanargmax(area)) if np.isfinite(area).any() else start)
+    selected.append(n - 1)
+    return np.asarray(selected)
+
+
+# ax.plot for long series, min/max decimated to about max_points
+def plot_line(ax, index, values, max_points=4000, **kwargs):
+    keep = minmax_indices(values, max_points // 2)
+    return ax.plot(np.asarray(index)[keep], np.asarray(values)[keep], **kwargs)
+
+
+# Wyckoff phase shading (fill_between per phase) on a decimated copy of the series
+def shade_phases(ax, index, close, phase, max_points=4000, alpha=0.2):
+    keep = minmax_indices(close, max_points // 2)
+    index, close, phase = np.asarray(index)[keep], np.asarray(close)[keep], np.asarray(phase)[keep]
+    for name, color in PHASE_COLORS.items():
+        ax.fill_between(index, close, where=phase == name, color=color, alpha=alpha, label=name)
+
+
+# Buy/Sell markers only ('Hold' bars are already shown by the price line), thinned to max_points each
+def signal_scatter(ax, index, close, signal, max_points=4000, marker='o'):
+    signal = np.asarray(signal, dtype=object)
+    for name, color in SIGNAL_COLORS.items():
+        at = np.flatnonzero(signal == name)
+        if len(at):
+            at = at[np.linspace(0, len(at) - 1, min(len(at), max_points)).astype(int)]
+            ax.plot(np.asarray(index)[at], np.asarray(close)[at], linestyle='none', marker=marker,
+                    color=color, label=name)
+
+
+# Off-screen charts for one analysed symbol, written as PNGs; returns the file paths
+def render_symbol(data, symbol, out_dir=PLOT_DIR, max_points=4000):
+    os.makedirs(out_dir, exist_ok=True)
+    safe_symbol = ''.join(c if c.isalnum() else '_' for c in symbol)
+    paths = []
+
+    def save(figure, chart):
+        path = os.path.join(out_dir, f'{safe_symbol}_{chart}.png')
+        figure.savefig(path)
+        paths.append(path)
+
+    figure = Figure(figsize=(14, 6))
+    ax = figure.subplots()
+    plot_line(ax, data.index, data['Close'], max_points, label='Close Price', color='blue')
+    if 'Phase' in data:
+        shade_phases(ax, data.index, data['Close'], data['Phase'].astype(object), max_points)
+    if 'Signal' in data:
+        signal_scatter(ax, data.index, data['Close'], data['Signal'], max_points)
+    ax.set_title(f'{symbol} Wyckoff Phases and Signals')
+    ax.legend(loc='upper left')
+    save(figure, 'phases')
+
+    if 'Vol_Osc' in data:
+        figure = Figure(figsize=(14, 6))
+        ax = figure.subplots()
+        plot_line(ax, data.index, data['Vol_Osc'], max_points, label='Volume Oscillator', color='purple')
+        if 'Significant' in data:
+            plot_line(ax, data.index, data['Significant'], max_points, label='High Amplitude Frequencies',
+                      color='orange')
+        ax.axhline(0, color='black', linestyle='--')
+        ax.set_title(f'{symbol} Volume Oscillator')
+        ax.legend(loc='upper left')
+        save(figure, 'vol_osc')
+    return paths
+
+
+def _render_symbol_args(args):
+    return render_symbol(*args)
+
+
+# Render many symbols in parallel worker processes; frames maps symbol -> analysed DataFrame
+def render_many(frames, out_dir=PLOT_DIR, workers=None, max_points=4000):
+    jobs = [(data, symbol, out_dir, max_points) for symbol, data in frames.items()]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(frames, executor.map(_render_symbol_args, jobs)))
@@ -0,0 +1,191 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Label columns the scripts write; stored as categoricals (dictionary-encoded in Parquet)
+CATEGORICAL_COLUMNS = ['Phase', 'Signal', 'VolOsc_Peak', 'Price_Movement']
+
+
+# Compact the frame for storage: categorical label columns and optional float32 floats
+def compact(data, float32=False):
+    data = data.copy()
+    for column in CATEGORICAL_COLUMNS:
+        if column in data.columns:
+            data[column] = data[column].astype('category')
+    if float32:
+        floats = data.select_dtypes(include='float64').columns
+        data[floats] = data[floats].astype(np.float32)
+    return data
+
+
+# Write one result frame to a single Parquet (default) or Feather file
+def write_results(data, path, float32=False, compression='zstd'):
+    data = compact(data, float32=float32)
+    tmp_path = path + '.tmp'
+    if path.endswith('.feather'):
+        data.reset_index().to_feather(tmp_path, compression=compression)
+    else:
+        data.to_parquet(tmp_path, compression=compression)
+    os.replace(tmp_path, path)
+    return path
+
+
+# Read a result file, optionally only some columns
+def read_results(path, columns=None):
+    if path.endswith('.feather'):
+        from pyarrow import ipc
+
+        with ipc.open_file(path) as reader:
+            index_column = reader.schema.names[0]
+        data = pd.read_feather(path, columns=None if columns is None else [index_column] + list(columns))
+        return data.set_index(index_column)
+    return pd.read_parquet(path, columns=columns)
+
+
+# Append-per-run partitioned store: <root>/<artifact>/symbol=<symbol>/run=<run_id>/part.parquet
+class ResultsStore:
+    def __init__(self, root='results', float32=False, compression='zstd'):
+        self.root = root
+        self.float32 = float32
+        self.compression = compression
+
+    def append(self, artifact, data, symbol, run_id=None):
+        run_id = run_id or time.strftime('%Y%m%dT%H%M%S')
+        directory = os.path.join(self.root, artifact, f'symbol={symbol}', f'run={run_id}')
+        os.makedirs(directory, exist_ok=True)
+        return write_results(data, os.path.join(directory, 'part.parquet'),
+                             float32=self.float32, compression=self.compression)
+
+    # Column-projected read across partitions, optionally filtered by symbol and run
+    def read(self, artifact, columns=None, symbols=None, runs=None):
+        filters = []
+        if symbols is not None:
+            filters.append(('symbol', 'in', list(symbols)))
+        if runs is not None:
+            filters.append(('run', 'in', list(runs)))
+        return pd.read_parquet(os.path.join(self.root, artifact), columns=columns, filters=filters or None)
+
+
+# Incremental per-(artifact, symbol) results: each write appends one small Parquet segment holding
+# only bars after the last persisted timestamp, plus the rows among the last `revision_window`
+# persisted bars whose values changed (e.g. a partial last bar that has since closed). Older rows
+# are treated as final. Re-running on unchanged data writes nothing. Segments and the manifest are
+# replaced atomically; a segment not yet listed in the manifest is ignored and overwritten next run.
+# Layout: <root>/<artifact>/symbol=<symbol>/{_manifest.json, part-<seq>.parquet}
+class IncrementalResults:
+    def __init__(self, root='results', revision_window=24, float32=False, compression='zstd'):
+        self.root = root
+        self.revision_window = revision_window
+        self.float32 = float32
+        self.compression = compression
+
+    def _directory(self, artifact, symbol):
+        return os.path.join(self.root, artifact, f'symbol={symbol}')
+
+    def manifest(self, artifact, symbol):
+        path = os.path.join(self._directory(artifact, symbol), '_manifest.json')
+        if not os.path.exists(path):
+            return {'last_timestamp': None, 'rows': 0, 'next_segment': 0, 'segments': [], 'recent': {}}
+        with open(path) as handle:
+            return json.load(handle)
+
+    def _write_manifest(self, artifact, symbol, manifest):
+        path = os.path.join(self._directory(artifact, symbol), '_manifest.json')
+        with open(path + '.tmp', 'w') as handle:
+            json.dump(manifest, handle)
+        os.replace(path + '.tmp', path)
+
+    def _write_segment(self, artifact, symbol, manifest, data):
+        directory = self._directory(artifact, symbol)
+        os.makedirs(directory, exist_ok=True)
+        segment = f'part-{manifest["next_segment"]:06d}.parquet'
+        write_results(data, os.path.join(directory, segment), compression=self.compression)
+        return segment
+
+    # Persist the new and revised rows of `data` (a full or partial frame indexed by timestamp).
+    # Returns the number of rows written.
+    def write(self, artifact, symbol, data):
+        data = compact(data.sort_index(), float32=self.float32)
+        data = data[~data.index.duplicated(keep='last')]
+        manifest = self.manifest(artifact, symbol)
+        recent = manifest['recent']
+
+        # Only bars after the last persisted one, and the persisted bars still open to revision,
+        # are hashed and compared; the rest of the history is never touched
+        if manifest['last_timestamp'] is None:
+            first_new = 0
+        else:
+            first_new = data.index.searchsorted(pd.Timestamp(manifest['last_timestamp']), side='right')
+        candidates = data.iloc[max(0, first_new - len(recent)):]
+        new = np.arange(len(candidates)) >= len(candidates) - (len(data) - first_new)
+        keys = np.array([timestamp.isoformat() for timestamp in candidates.index], dtype=object)
+        hashes = pd.util.hash_pandas_object(candidates, index=False).astype(str).to_numpy(dtype=object)
+        revised = np.array([key in recent and recent[key] != digest for key, digest in zip(keys, hashes)], dtype=bool)
+        changed = new | revised
+        if not changed.any():
+            return 0
+
+        segment = self._write_segment(artifact, symbol, manifest, candidates[changed])
+        # recent stays in bar order: revised bars keep their place, new bars are later than all of them
+        recent = {**recent, **dict(zip(keys[changed].tolist(), hashes[changed].tolist()))}
+        newest = list(recent)[-self.revision_window:] if self.revision_window else []
+        self._write_manifest(artifact, symbol, {
+            'last_timestamp': str(keys[new][-1]) if new.any() else manifest['last_timestamp'],
+            'rows': manifest['rows'] + int(new.sum()),
+            'next_segment': manifest['next_segment'] + 1,
+            'segments': manifest['segments'] + [segment],
+            'recent': {key: recent[key] for key in newest},
+        })
+        return int(changed.sum())
+
+    # Full history for one symbol: segments in write order, the latest version of each bar wins.
+    # Label columns come back categorical even when segments hold different category sets.
+    def read(self, artifact, symbol, columns=None):
+        manifest = self.manifest(artifact, symbol)
+        directory = self._directory(artifact, symbol)
+        parts = [read_results(os.path.join(directory, segment), columns=columns) for segment in manifest['segments']]
+        if not parts:
+            return pd.DataFrame(columns=columns)
+        data = pd.concat(parts)
+        return compact(data[~data.index.duplicated(keep='last')].sort_index())
+
+    # Fold all segments into one (run occasionally to bound the number of files)
+    def consolidate(self, artifact, symbol):
+        manifest = self.manifest(artifact, symbol)
+        if len(manifest['segments']) < 2:
+            return
+        segment = self._write_segment(artifact, symbol, manifest, self.read(artifact, symbol))
+        self._write_manifest(artifact, symbol, {**manifest, 'next_segment': manifest['next_segment'] + 1,
+                                                'segments': [segment]})
+        for old in manifest['segments']:
+            os.remove(os.path.join(self._directory(artifact, symbol), old))
+
+
+# Append-only replacement for write_results(data, '<artifact>.parquet') in the periodic scripts
+def append_results(data, artifact, symbol, root='results', revision_window=24):
+    return IncrementalResults(root, revision_window=revision_window).write(artifact, symbol, data)
+
+
+# Convert one of the existing CSV artifacts to the columnar format
+def convert_csv(csv_path, out_path=None, float32=False, compression='zstd'):
+    out_path = out_path or os.path.splitext(csv_path)[0] + '.parquet'
+    data = pd.read_csv(csv_path, index_col=0)
+    data.index = pd.to_datetime(data.index, utc=True)
+    return write_results(data, out_path, float32=float32, compression=compression)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert CSV result files to compressed Parquet/Feather')
+    parser.add_argument('csv_files', nargs='+')
+    parser.add_argument('--float32', action='store_true')
+    parser.add_argument('--format', choices=['parquet', 'feather'], default='parquet')
+    args = parser.parse_args()
+
+    for csv_path in args.csv_files:
+        out_path = os.path.splitext(csv_path)[0] + '.' + args.format
+        convert_csv(csv_path, out_path, float32=args.float32)
+        print(f"{csv_path} ({os.path.getsize(csv_path)} bytes) -> {out_path} ({os.path.getsize(out_path)} bytes)")
@@ -0,0 +1,22 @@
+import numpy as np
+
+from oscillators import rsi_volume_rule
+
+
+# Generate Trading Signals only when the amplitude of the volume oscillator is high and meets Wyckoff criteria
+# (the rule from wycoff_high_amp_freq_1.py / filtered_high_amp_freq_rel_with_price.py)
+def high_amplitude_wyckoff_signals(data, significant_time_series, percentile=90):
+    high_amplitude_threshold = np.percentile(significant_time_series, percentile)
+    data['Signal'] = np.where(
+        (significant_time_series > high_amplitude_threshold) & (data['Phase'] == 'Markup'), 'Buy',
+        np.where((significant_time_series < -high_amplitude_threshold) & (data['Phase'] == 'Markdown'), 'Sell', None)
+    )
+    return data
+
+
+# RSI/volume-oscillator signals (the volume_wycoff.py rule): Buy when RSI is oversold while the
+# volume oscillator is positive, Sell when RSI is overbought while it is negative
+def rsi_volume_signals(data, oversold=30, overbought=70):
+    buy, sell = rsi_volume_rule(data['RSI'].to_numpy(), data['Vol_Osc'].to_numpy(), oversold, overbought)
+    data['Signal'] = np.where(buy, 'Buy', np.where(sell, 'Sell', None))
+    return data
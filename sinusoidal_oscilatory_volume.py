@@ -1,16 +1,16 @@
-import yfinance as yf
+from market_data import download
 import numpy as np
 import pandas as pd
-from arch import arch_model
-import pymc3 as pm
-from scipy.fftpack import fft
+from volatility import GarchVolatility, KalmanVolatility
+from spectral import welch_spectrum
 import matplotlib.pyplot as plt
+from reporting import PLOTTING, show
 
 
 
 
 # Download historical data for Crude Oil futures (symbol: CL=F)
-data = yf.download("CL=F", start="2010-01-01", end="2024-01-01", interval="1h")
+data = download("CL=F", start="2010-01-01", end="2024-01-01", interval="1h")
 data['Returns'] = data['Adj Close'].pct_change().dropna()
 
 # Volume Oscillator Calculation
@@ -22,47 +22,34 @@ data.dropna(inplace=True)
 
 
 # Fit a GARCH(1,1) model to the returns
-model = arch_model(data['Returns'], vol='Garch', p=1, q=1)
-garch_result = model.fit(disp="off")
-data['GARCH_Volatility'] = np.sqrt(garch_result.conditional_volatility)
+garch_volatility = GarchVolatility()
+data['GARCH_Volatility'] = np.sqrt(garch_volatility.fit(data['Returns']))
 
 
 
-with pm.Model() as model:
-    # Priors for the parameters
-    sigma = pm.HalfNormal('sigma', sd=1)
-    phi = pm.Beta('phi', alpha=2, beta=2)
-    
-    # Latent volatility process
-    volatility = pm.GaussianRandomWalk('volatility', sd=sigma, shape=len(data['Returns']))
-    
-    # Observation equation
-    epsilon = pm.Normal('epsilon', mu=0, sd=pm.math.exp(volatility / 2), observed=data['Returns'])
-    
-    # Inference
-    trace = pm.sample(2000, tune=1000, return_inferencedata=True)
+# Latent log-volatility random walk estimated with a Kalman filter/smoother (linear time)
+bayesian_volatility = KalmanVolatility()
+data['Bayesian_Volatility'] = bayesian_volatility.fit(data['Returns'])
 
-# Extract the latent volatility estimates
-volatility_estimates = trace.posterior['volatility'].mean(dim=['chain', 'draw'])
-data['Bayesian_Volatility'] = volatility_estimates.values
 
-
-# Apply FFT to the normalized Volume Oscillator
-vol_osc_fft = fft(data['VolOscNorm'])
-frequencies = np.fft.fftfreq(len(vol_osc_fft))
+# Welch-averaged spectrum of the normalized Volume Oscillator (overlapping segments, constant memory)
+vol_osc_spectrum = welch_spectrum(data['VolOscNorm'].to_numpy(dtype=float), segment=1024)
+frequencies = vol_osc_spectrum.frequencies
 
 # Plot the amplitude spectrum
-plt.figure(figsize=(10, 5))
-plt.plot(frequencies, np.abs(vol_osc_fft))
-plt.title('Volume Oscillator FFT Amplitude Spectrum')
-plt.xlabel('Frequency')
-plt.ylabel('Amplitude')
-plt.show()
+if PLOTTING:
+    plt.figure(figsize=(10, 5))
+    plt.plot(frequencies, vol_osc_spectrum.amplitudes)
+    plt.title('Volume Oscillator Welch Amplitude Spectrum')
+    plt.xlabel('Frequency')
+    plt.ylabel('Amplitude')
+    show()
 
 # Detect sinusoidal pattern
-sinusoidal_component = np.argmax(np.abs(vol_osc_fft))
-sinusoidal_freq = frequencies[sinusoidal_component]
-print(f"Detected Sinusoidal Frequency: {sinusoidal_freq}")
+cycle = vol_osc_spectrum.dominant_cycle(min_period=4, max_period=512)
+sinusoidal_freq, sinusoidal_amplitude = cycle['frequency'], cycle['amplitude']
+print(f"Detected Sinusoidal Frequency: {sinusoidal_freq} (period {cycle['period']:.1f} bars, "
+      f"confidence {cycle['confidence']:.2f})")
 
 
 # Combine GARCH and Bayesian Volatility to predict peaks
@@ -76,10 +63,11 @@ data['Peaks'] = np.nan
 data['Peaks'][peaks] = data['Volatility'][peaks]
 
 # Plotting the results
-plt.figure(figsize=(14, 7))
-plt.plot(data.index, data['Volatility'], label='Combined Volatility')
-plt.plot(data.index, data['Peaks'], "x", label='Peaks')
-plt.plot(data.index, data['VolOscNorm'], label='Volume Oscillator')
-plt.title('Volatility and Volume Oscillator with Peak Detection')
-plt.legend()
-plt.show()
+if PLOTTING:
+    plt.figure(figsize=(14, 7))
+    plt.plot(data.index, data['Volatility'], label='Combined Volatility')
+    plt.plot(data.index, data['Peaks'], "x", label='Peaks')
+    plt.plot(data.index, data['VolOscNorm'], label='Volume Oscillator')
+    plt.title('Volatility and Volume Oscillator with Peak Detection')
+    plt.legend()
+    show()
@@ -0,0 +1,226 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.fft import irfft, next_fast_len, rfft
+
+from cycles import spectrum_peak
+
+
+# Amplitudes of the full two-sided spectrum rebuilt from the one-sided rfft amplitudes (last axis)
+def full_amplitudes(half_amplitudes, n):
+    mirrored = half_amplitudes[..., 1:n - n // 2][..., ::-1]
+    return np.concatenate([half_amplitudes, mirrored], axis=-1)
+
+
+# Boolean mask over the rfft bins to keep (per row when spectrum is 2-D)
+# percentile: keep bins whose amplitude is above that percentile of the full (two-sided) spectrum,
+#             which is exactly the np.percentile(np.abs(fft(x)), p) threshold used in the scripts
+# top_k:      keep the k distinct frequencies with the largest amplitude
+def select_bins(spectrum, n, percentile=None, top_k=None):
+    if (percentile is None) == (top_k is None):
+        raise ValueError("Pass exactly one of percentile or top_k")
+    amplitudes = np.abs(spectrum)
+    if top_k is not None:
+        mask = np.zeros(amplitudes.shape, dtype=bool)
+        if top_k > 0:
+            top = np.argsort(amplitudes, axis=-1)[..., -top_k:]
+            np.put_along_axis(mask, top, True, axis=-1)
+        return mask
+    threshold = np.percentile(full_amplitudes(amplitudes, n), percentile, axis=-1, keepdims=True)
+    return amplitudes > threshold
+
+
+# Time-domain signal made of the selected bins only, using a single inverse transform
+def reconstruct(spectrum, mask, n):
+    return irfft(np.where(mask, spectrum, 0), n, axis=-1)
+
+
+# Replacement for the per-bin ifft loop that builds significant_time_series
+def high_amplitude_series(signal, percentile=90, top_k=None):
+    signal = np.asarray(signal, dtype=float)
+    n = len(signal)
+    spectrum = rfft(signal)
+    if top_k is not None:
+        percentile = None
+    mask = select_bins(spectrum, n, percentile=percentile, top_k=top_k)
+    return reconstruct(spectrum, mask, n)
+
+
+# Rolling short-time spectrum of the last `window` samples, updated per bar with a sliding DFT.
+# Every bar emits the causal value of the high-amplitude reconstruction at the newest sample,
+# so no future bar ever leaks into a past signal. The bin selection is refreshed every `hop` bars
+# and the spectrum is recomputed exactly every `resync` bars to stop twiddle round-off drift.
+class SlidingSpectrum:
+    def __init__(self, window, hop=1, percentile=90, top_k=None, resync=None):
+        if top_k is not None:
+            percentile = None
+        self.window = window
+        self.hop = hop
+        self.percentile = percentile
+        self.top_k = top_k
+        self.resync = resync if resync is not None else window
+
+        n_bins = window // 2 + 1
+        k = np.arange(n_bins)
+        self._twiddle = np.exp(2j * np.pi * k / window)
+        # irfft weights for the newest sample: DC and Nyquist count once, the rest twice
+        weights = np.full(n_bins, 2.0)
+        weights[0] = 1.0
+        if window % 2 == 0:
+            weights[-1] = 1.0
+        self._tail = weights * np.exp(-2j * np.pi * k / window) / window
+
+        self.buffer = np.zeros(window)
+        self.spectrum = np.zeros(n_bins, dtype=complex)
+        self.mask = np.zeros(n_bins, dtype=bool)
+        self.pos = 0
+        self.count = 0
+        self._since_sync = 0
+        self._since_hop = 0
+
+    @property
+    def ready(self):
+        return self.count >= self.window
+
+    def update(self, value):
+        # Missing oscillator values count as 0, the same as the scripts' fillna(0)
+        value = 0.0 if np.isnan(value) else float(value)
+        old = self.buffer[self.pos]
+        self.buffer[self.pos] = value
+        self.pos = (self.pos + 1) % self.window
+        self.count += 1
+
+        self._since_sync += 1
+        if self._since_sync >= self.resync or self.count == self.window:
+            self.spectrum = rfft(np.roll(self.buffer, -self.pos))
+            self._since_sync = 0
+        else:
+            self.spectrum = (self.spectrum - old + value) * self._twiddle
+
+        if not self.ready:
+            return np.nan
+        if self._since_hop == 0:
+            self.mask = select_bins(self.spectrum, self.window, percentile=self.percentile, top_k=self.top_k)
+        self._since_hop = (self._since_hop + 1) % self.hop
+        return float(np.real(np.dot(self.spectrum[self.mask], self._tail[self.mask])))
+
+
+# Causal significant_time_series: one SlidingSpectrum value per bar (NaN during warm-up)
+def causal_high_amplitude_series(signal, window, hop=1, percentile=90, top_k=None):
+    spectrum = SlidingSpectrum(window, hop=hop, percentile=percentile, top_k=top_k)
+    return np.array([spectrum.update(value) for value in np.asarray(signal, dtype=float)])
+
+
+# Welch-averaged amplitude spectrum accumulated segment by segment, so memory stays constant
+# however long the series is. Feed chunks in order with update(); overlap between chunks is
+# carried internally. Segments are transformed in batches with a multithreaded rfft.
+class WelchAccumulator:
+    def __init__(self, segment=1024, overlap=0.5, batch=256, workers=-1):
+        self.segment = segment
+        self.step = max(1, int(segment * (1 - overlap)))
+        self.batch = batch
+        self.workers = workers
+        self.window = np.hanning(segment)
+        self.power = np.zeros(segment // 2 + 1)
+        self.count = 0
+        self._tail = np.empty(0)
+
+    def update(self, chunk):
+        values = np.concatenate([self._tail, np.nan_to_num(np.asarray(chunk, dtype=float))])
+        n_segments = 0 if len(values) < self.segment else (len(values) - self.segment) // self.step + 1
+        for first in range(0, n_segments, self.batch):
+            starts = np.arange(first, min(first + self.batch, n_segments)) * self.step
+            segments = values[starts[:, None] + np.arange(self.segment)]
+            segments = segments - segments.mean(axis=1, keepdims=True)
+            spectra = rfft(segments * self.window, axis=-1, workers=self.workers)
+            self.power += np.sum(np.abs(spectra) ** 2, axis=0)
+            self.count += len(starts)
+        self._tail = values[n_segments * self.step:]
+        return self
+
+    @property
+    def frequencies(self):
+        return np.fft.rfftfreq(self.segment)
+
+    @property
+    def amplitudes(self):
+        return np.sqrt(self.power / max(self.count, 1))
+
+    # Strongest non-DC frequency (cycles per bar) and its averaged amplitude
+    def dominant_frequency(self):
+        amplitudes = self.amplitudes
+        peak = 1 + int(np.argmax(amplitudes[1:]))
+        return self.frequencies[peak], amplitudes[peak]
+
+    # Sub-bin dominant cycle within [min_period, max_period] bars, with its amplitude and a confidence
+    # score (see cycles.spectrum_peak)
+    def dominant_cycle(self, min_period=2, max_period=None):
+        return spectrum_peak(self.frequencies, self.power / max(self.count, 1), self.window, min_period, max_period)
+
+
+# Welch amplitude spectrum of a long (possibly memory-mapped) series, read `chunk_size` bars at a time
+def welch_spectrum(series, segment=1024, overlap=0.5, chunk_size=1 << 20, workers=-1):
+    accumulator = WelchAccumulator(segment=segment, overlap=overlap, workers=workers)
+    for start in range(0, len(series), chunk_size):
+        accumulator.update(series[start:start + chunk_size])
+    return accumulator
+
+
+# Frequency axis (cycles per bar) of an n-point rfft, computed once per length and shared read-only
+@lru_cache(maxsize=None)
+def rfft_frequencies(n):
+    frequencies = np.fft.rfftfreq(n)
+    frequencies.flags.writeable = False
+    return frequencies
+
+
+# Stack the most recent `length` bars of each symbol's oscillator into a (symbols x length) array
+# (NaN -> 0 like oscillator_array); symbols with fewer bars are left out of the batch
+def stack_windows(series_by_symbol, length):
+    symbols = [symbol for symbol, values in series_by_symbol.items() if len(values) >= length]
+    windows = np.empty((len(symbols), length))
+    for row, symbol in enumerate(symbols):
+        windows[row] = np.asarray(series_by_symbol[symbol], dtype=float)[-length:]
+    np.nan_to_num(windows, copy=False)
+    return symbols, windows
+
+
+# Batched universe scan: one multithreaded rfft over a (symbols x length) stack of equal-length
+# windows, returning each row's dominant (non-DC) frequency and amplitude and its high-amplitude bin
+# mask. Frequency axes and the zero-padded input buffer are kept per (rows, length), so repeated
+# scans of the same shape (e.g. every bar) allocate nothing new on the way in.
+# pad=True transforms at next_fast_len(length) instead of length (awkward prime lengths).
+class SpectralEngine:
+    def __init__(self, percentile=90, top_k=None, workers=-1, pad=False):
+        self.percentile = None if top_k is not None else percentile
+        self.top_k = top_k
+        self.workers = workers
+        self.pad = pad
+        self._buffers = {}
+
+    def _transform(self, windows):
+        rows, length = windows.shape
+        n = next_fast_len(length, real=True) if self.pad else length
+        if n == length:
+            return rfft(windows, axis=-1, workers=self.workers), n
+        buffer = self._buffers.get((rows, n))
+        if buffer is None:
+            buffer = self._buffers[(rows, n)] = np.zeros((rows, n))
+        buffer[:, :length] = windows
+        return rfft(buffer, axis=-1, workers=self.workers), n
+
+    def scan(self, windows, reconstruct_series=False):
+        windows = np.atleast_2d(np.asarray(windows, dtype=float))
+        spectrum, n = self._transform(windows)
+        amplitudes = np.abs(spectrum)
+        peak = 1 + np.argmax(amplitudes[:, 1:], axis=-1)
+        frequencies = rfft_frequencies(n)
+        result = {
+            'frequencies': frequencies,
+            'dominant_frequency': frequencies[peak],
+            'dominant_amplitude': np.take_along_axis(amplitudes, peak[:, None], axis=-1)[:, 0],
+            'mask': select_bins(spectrum, n, percentile=self.percentile, top_k=self.top_k),
+        }
+        if reconstruct_series:
+            result['significant'] = reconstruct(spectrum, result['mask'], n)[:, :windows.shape[1]]
+        return result
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from scipy.fft import rfft
+
+from backtest import BARS_PER_YEAR, BUY, HOLD, SELL, backtest
+from indicators import rolling_means
+from spectral import reconstruct, select_bins
+from wyckoff import PHASES, wyckoff_codes
+
+METRICS = ['sharpe', 'total_return', 'hit_rate', 'max_drawdown', 'trades']
+
+
+# Buy/Sell codes for every significant series row, using the high-amplitude Wyckoff rule
+def _signal_codes(significant, phase_codes, signal_percentile):
+    threshold = np.percentile(significant, signal_percentile, axis=-1, keepdims=True)
+    buy = (significant > threshold) & (phase_codes == PHASES.index('Markup'))
+    sell = (significant < -threshold) & (phase_codes == PHASES.index('Markdown'))
+    return np.where(buy, BUY, np.where(sell, SELL, HOLD)).astype(np.int8)
+
+
+# Grid search over volume oscillator windows and the FFT / signal threshold percentiles.
+# One rfft per oscillator is shared by every threshold, and each (short window, threshold)
+# slice is scored across all long windows in one batched backtest call. Sharpe is annualized for
+# hourly bars unless periods_per_year says otherwise (see backtest.BARS_PER_YEAR).
+def parameter_sweep(data, short_periods=range(5, 25), long_periods=range(20, 60, 2),
+                    fft_percentiles=range(50, 100, 5), signal_percentiles=(90,),
+                    ma_windows=(50, 200), cost=0.0, periods_per_year=BARS_PER_YEAR['1h'],
+                    score='sharpe'):
+    close = data['Close'].to_numpy(dtype=float)
+    volume = data['Volume'].to_numpy(dtype=float)
+    n = len(close)
+
+    ma = rolling_means(close, ma_windows)
+    phase_codes = wyckoff_codes(close, ma[ma_windows[0]], ma[ma_windows[1]])
+
+    # One cumulative sum of Volume serves every short and long window; rows follow the period lists
+    short_periods, long_periods = list(short_periods), list(long_periods)
+    volume_means = rolling_means(volume, set(short_periods) | set(long_periods))
+    short_means = np.stack([volume_means[period] for period in short_periods])
+    long_means = np.stack([volume_means[period] for period in long_periods])
+
+    rows = []
+    for s, short_period in enumerate(short_periods):
+        valid = [l for l, long_period in enumerate(long_periods) if long_period > short_period]
+        if not valid:
+            continue
+        with np.errstate(divide='ignore', invalid='ignore'):
+            oscillators = (short_means[s] - long_means[valid]) / long_means[valid] * 100
+        spectra = rfft(np.nan_to_num(oscillators, nan=0.0), axis=-1)
+
+        for fft_percentile in fft_percentiles:
+            mask = select_bins(spectra, n, percentile=fft_percentile)
+            significant = reconstruct(spectra, mask, n)
+            for signal_percentile in signal_percentiles:
+                codes = _signal_codes(significant, phase_codes, signal_percentile)
+                result = backtest(close, codes, cost=cost, periods_per_year=periods_per_year)
+                for row, l in enumerate(valid):
+                    rows.append((short_period, long_periods[l], fft_percentile, signal_percentile,
+                                 *(result[metric][row] for metric in METRICS)))
+
+    index = ['short_period', 'long_period', 'fft_percentile', 'signal_percentile']
+    grid = pd.DataFrame(rows, columns=index + METRICS).set_index(index)
+    return grid.sort_values(score, ascending=False)
+
@@ -1,8 +1,9 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from scipy.fft import fft, ifft
+from scipy.fft import fft
 import yfinance as yf
+from spectral import high_amplitude_series
 
 # Download data (unchanged)
 
@@ -24,9 +25,7 @@ high_amp_indices = np.where(amplitudes > threshold)[0]
 high_amp_frequencies = frequencies[high_amp_indices]
 
 # Map to Time Domain
-significant_time_series = np.zeros_like(volume_oscillator, dtype=float)
-for idx in high_amp_indices:
-    significant_time_series += np.real(ifft(fft_values * (np.arange(len(fft_values)) == idx)))
+significant_time_series = high_amplitude_series(volume_oscillator, percentile=90)
 
 # Generate Trading Signals (improved)
 data['Signal'] = np.where(
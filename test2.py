@@ -3,11 +3,12 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from scipy.fft import fft
 
-import yfinance as yf
+from market_data import download
+from reporting import PLOTTING, show
 
 # Download historical data for NG=F (Natural Gas Futures) within the last 3 months with an hourly interval
 symbol = 'NG=F'
-data = yf.download(symbol, period="3mo", interval="1h")
+data = download(symbol, period="3mo", interval="1h")
 
 # Calculate moving averages
 data['50_MA'] = data['Close'].rolling(window=50).mean()
@@ -38,9 +39,10 @@ high_amplitude_frequencies = frequencies[high_amp_indices]
 high_amplitude_values = amplitudes[high_amp_indices]
 
 # Plot the high amplitude frequencies
-plt.figure(figsize=(10, 6))
-plt.stem(high_amplitude_frequencies, high_amplitude_values, use_line_collection=True, basefmt=" ")
-plt.title('High Amplitude Frequencies in Volume Oscillator')
-plt.xlabel('Frequency')
-plt.ylabel('Amplitude')
-plt.show()
+if PLOTTING:
+    plt.figure(figsize=(10, 6))
+    plt.stem(high_amplitude_frequencies, high_amplitude_values, use_line_collection=True, basefmt=" ")
+    plt.title('High Amplitude Frequencies in Volume Oscillator')
+    plt.xlabel('Frequency')
+    plt.ylabel('Amplitude')
+    show()
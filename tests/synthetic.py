@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+
+
+# Random-walk hourly OHLCV bars with a fixed seed, shared by the tests and the benchmark harness
+def synthetic_ohlcv(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 75 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.001, n)) * close
+    volume = rng.integers(500, 20_000, n).astype(np.int64)
+    index = pd.date_range('2010-01-01', periods=n, freq='h', tz='UTC')
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) + spread,
+        'Low': np.minimum(open_, close) - spread,
+        'Close': close,
+        'Adj Close': close,
+        'Volume': volume,
+    }, index=index)
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import async_fetch
+from async_fetch import AsyncFetcher, FetchError
+
+
+def _chart(bars=5):
+    start = 1_700_000_000
+    return {'chart': {'error': None, 'result': [{
+        'meta': {'exchangeTimezoneName': 'America/New_York'},
+        'timestamp': [start + 3600 * i for i in range(bars)],
+        'indicators': {
+            'quote': [{'open': [1.0 + i for i in range(bars)], 'high': [2.0 + i for i in range(bars)],
+                       'low': [0.5 + i for i in range(bars)], 'close': [1.5 + i for i in range(bars)],
+                       'volume': [100 * (i + 1) for i in range(bars)]}],
+            'adjclose': [{'adjclose': [1.4 + i for i in range(bars)]}],
+        },
+    }]}}
+
+
+# Mock chart endpoint: FLAKY answers 503 `failures` times before succeeding, MISSING is a 404
+def _app(hits, failures):
+    async def chart(request):
+        symbol = request.match_info['symbol']
+        hits[symbol] = hits.get(symbol, 0) + 1
+        if symbol == 'MISSING':
+            return web.Response(status=404)
+        if symbol == 'FLAKY' and hits[symbol] <= failures:
+            return web.Response(status=503)
+        return web.json_response(_chart())
+
+    app = web.Application()
+    app.router.add_get('/chart/{symbol}', chart)
+    return app
+
+
+def _fetch_many(symbols, failures=2, **options):
+    hits = {}
+
+    async def main():
+        async with TestServer(_app(hits, failures)) as server:
+            fetcher = AsyncFetcher(base_url=str(server.make_url('/chart')), rate=1000, **options)
+            return await fetcher.fetch_many([{'symbol': symbol, 'interval': '1h', 'period': '5d'}
+                                             for symbol in symbols])
+
+    return asyncio.run(main()), hits
+
+
+def test_fetch_many_parses_charts_and_reports_failures_per_symbol():
+    outcomes, hits = _fetch_many(['CL=F', 'MISSING'], retries=3, backoff=0)
+    frame = outcomes[('CL=F', '1h')]
+    assert list(frame['Close']) == [1.5, 2.5, 3.5, 4.5, 5.5]
+    assert list(frame['Adj Close']) == pytest.approx([1.4, 2.4, 3.4, 4.4, 5.4])
+    assert str(frame.index.tz) == 'America/New_York'
+    # A 404 is not retried
+    assert isinstance(outcomes[('MISSING', '1h')], FetchError)
+    assert hits['MISSING'] == 1
+
+
+def test_retryable_status_is_retried_with_exponential_backoff(monkeypatch):
+    delays = []
+    sleep = asyncio.sleep
+
+    # aiohttp also yields with sleep(0); only the backoff delays are recorded
+    async def record_sleep(delay):
+        if delay:
+            delays.append(delay)
+        await sleep(0)
+
+    monkeypatch.setattr(async_fetch.asyncio, 'sleep', record_sleep)
+    monkeypatch.setattr(async_fetch.random, 'random', lambda: 0.0)
+    outcomes, hits = _fetch_many(['FLAKY'], failures=2, retries=3, backoff=0.5)
+    assert len(outcomes[('FLAKY', '1h')]) == 5
+    assert hits['FLAKY'] == 3
+    assert delays == [0.5, 1.0]
+
+
+def test_retries_give_up_with_the_last_error():
+    outcomes, hits = _fetch_many(['FLAKY'], failures=10, retries=2, backoff=0)
+    assert isinstance(outcomes[('FLAKY', '1h')], FetchError)
+    assert '503' in str(outcomes[('FLAKY', '1h')])
+    assert hits['FLAKY'] == 3
@@ -0,0 +1,14 @@
+import numpy as np
+import pytest
+
+from backtest import BARS_PER_YEAR, backtest
+from synthetic import synthetic_ohlcv
+
+
+def test_sharpe_is_annualized_for_hourly_bars_by_default():
+    close = synthetic_ohlcv(2000, seed=5)['Close'].to_numpy()
+    signals = np.where(np.arange(2000) % 100 < 50, 'Buy', 'Sell')
+    hourly = backtest(close, signals)['sharpe']
+    daily = backtest(close, signals, periods_per_year=BARS_PER_YEAR['1d'])['sharpe']
+    assert BARS_PER_YEAR['1h'] == 23 * 252
+    assert hourly == pytest.approx(daily * np.sqrt(23))
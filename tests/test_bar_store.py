@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bar_store import BarStore, volume_oscillator_chunked
+from synthetic import synthetic_ohlcv
+
+
+def test_chunked_oscillator_survives_missing_volume(tmp_path):
+    data = synthetic_ohlcv(1401)
+    data['Volume'] = data['Volume'].astype(float)
+    data.iloc[300, data.columns.get_loc('Volume')] = np.nan
+    store = BarStore(str(tmp_path))
+    store.append('CL=F', data)
+    volume_oscillator_chunked(store, 'CL=F', chunk_size=500)
+
+    short = data['Volume'].rolling(14).mean().to_numpy()
+    long = data['Volume'].rolling(28).mean().to_numpy()
+    np.testing.assert_allclose(store.column('CL=F', 'Short_Vol_MA'), short, rtol=1e-10)
+    np.testing.assert_allclose(store.column('CL=F', 'Vol_Osc'), (short - long) / long * 100, rtol=1e-9)
+
+
+def test_append_with_wrong_columns_leaves_the_store_readable(tmp_path):
+    data = synthetic_ohlcv(300)
+    store = BarStore(str(tmp_path))
+    store.append('CL=F', data)
+    volume_oscillator_chunked(store, 'CL=F')
+    with pytest.raises(ValueError, match='do not match'):
+        store.append('CL=F', synthetic_ohlcv(310).iloc[300:].drop(columns='Open'))
+    assert store.length('CL=F') == 300
+    assert 'Vol_Osc' in store.read('CL=F').columns
+
+
+def test_overlapping_append_keeps_only_new_bars(tmp_path):
+    data = synthetic_ohlcv(500)
+    store = BarStore(str(tmp_path))
+    store.append('CL=F', data.iloc[:300])
+    volume_oscillator_chunked(store, 'CL=F')
+    assert store.append('CL=F', data.iloc[:300]) == 0
+    assert 'Vol_Osc' in store.meta('CL=F')['columns']
+    assert store.append('CL=F', data.iloc[200:]) == 200
+    assert store.meta('CL=F')['derived'] == []
+    stored = store.read('CL=F')
+    assert stored.index.is_monotonic_increasing and stored.index.is_unique
+    pd.testing.assert_frame_equal(stored, data.astype(float), check_freq=False, check_index_type=False)
+
+
+def test_create_column_needs_stored_bars(tmp_path):
+    store = BarStore(str(tmp_path))
+    with pytest.raises(ValueError, match='No bars stored'):
+        store.create_column('NG=F', 'Vol_Osc')
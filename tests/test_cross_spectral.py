@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from scipy.signal import coherence
+
+from cross_spectral import coherence_phase, cross_correlation, lead_lag, rolling_cross_spectrum
+
+
+def _leading_pair(n=4000, shift=5, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=n + shift)
+    # y[t + shift] repeats x[t] (plus noise): x leads y by `shift` bars
+    return x[shift:], x[:n] + 0.3 * rng.normal(size=n)
+
+
+def test_positive_lag_means_x_leads_y():
+    x, y = _leading_pair(shift=5)
+    lag, corr = lead_lag(x, y, max_lag=20)
+    assert lag == 5 and corr > 0.9
+    lags, full = cross_correlation(x, y, max_lag=20)
+    assert full[lags == 5][0] == pytest.approx(corr)
+    assert lead_lag(y, x, max_lag=20)[0] == -5
+
+
+def test_coherence_matches_scipy_and_phase_gives_the_lead():
+    x, y = _leading_pair(shift=5)
+    spectrum = coherence_phase(x, y, segment=256)
+    frequencies, expected = coherence(x, y, nperseg=256, noverlap=128)
+    assert np.allclose(spectrum['frequencies'], frequencies)
+    assert np.allclose(spectrum['coherence'], expected)
+    # Below 0.1 cycles/bar the 5-bar delay's phase has not wrapped yet
+    low = (frequencies > 0) & (frequencies < 0.08)
+    assert (spectrum['lag_bars'][low] > 0).all()
+    assert np.median(spectrum['lag_bars'][low]) == pytest.approx(5, abs=0.2)
+
+
+def test_batched_rows_match_single_pairs():
+    pairs = [_leading_pair(n=1000, shift=shift, seed=shift) for shift in (2, 7)]
+    lags, corr = lead_lag(np.stack([x for x, _ in pairs]), np.stack([y for _, y in pairs]), max_lag=20)
+    assert list(lags) == [2, 7]
+    for row, (x, y) in enumerate(pairs):
+        assert corr[row] == pytest.approx(lead_lag(x, y, max_lag=20)[1])
+
+
+def test_rolling_cross_spectrum_rows_and_length_check():
+    x, y = _leading_pair(n=1200, shift=3)
+    rolling = rolling_cross_spectrum(x, y, window=500, hop=100)
+    assert list(rolling.index) == [499, 599, 699, 799, 899, 999, 1099, 1199]
+    assert (rolling['lag'] == 3).all()
+    with pytest.raises(ValueError, match='at least window=500'):
+        rolling_cross_spectrum(x[:400], y[:400], window=500)
+    with pytest.raises(ValueError, match='aligned'):
+        rolling_cross_spectrum(x, y[:-1], window=500)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from cycles import GoertzelTracker, band_cycle, dominant_cycle
+from spectral import welch_spectrum
+
+
+def _sinusoid(period, n=1000, amplitude=2.0, noise=0.5, seed=0):
+    rng = np.random.default_rng(seed)
+    bars = np.arange(n)
+    return amplitude * np.sin(2 * np.pi * bars / period + 0.3) + rng.normal(0, noise, n)
+
+
+@pytest.mark.parametrize('period', [23.7, 37.3, 61.3])
+def test_off_grid_cycles_are_found_below_candidate_spacing(period):
+    signal = _sinusoid(period)
+    for cycle in (band_cycle(signal, np.arange(20, 80, 2)), dominant_cycle(signal, 4, 200)):
+        assert cycle['period'] == pytest.approx(period, abs=0.05)
+        assert cycle['amplitude'] == pytest.approx(2.0, rel=0.05)
+        # Noise variance 0.25 next to the sinusoid's 2.0
+        assert cycle['confidence'] == pytest.approx(2.0 / 2.25, abs=0.05)
+
+
+def test_welch_cycle_uses_the_same_amplitude_and_confidence():
+    cycle = welch_spectrum(_sinusoid(61.3, n=100_000), segment=1024).dominant_cycle(4, 512)
+    assert cycle['period'] == pytest.approx(61.3, abs=0.2)
+    assert cycle['amplitude'] == pytest.approx(2.0, rel=0.05)
+    assert cycle['confidence'] == pytest.approx(2.0 / 2.25, abs=0.05)
+
+
+def test_search_ignores_dc_and_cycles_outside_the_band():
+    signal = 50 + _sinusoid(40.0) + 5 * np.sin(2 * np.pi * np.arange(1000) / 8)
+    assert dominant_cycle(signal)['period'] == pytest.approx(8, abs=0.05)
+    assert dominant_cycle(signal, min_period=20, max_period=100)['period'] == pytest.approx(40, abs=0.1)
+    assert band_cycle(signal, np.arange(20, 80, 2))['period'] == pytest.approx(40, abs=0.1)
+    with pytest.raises(ValueError, match='No frequency bins'):
+        dominant_cycle(signal, min_period=2000)
+
+
+def test_tracker_matches_band_cycle_on_every_window():
+    window, periods = 200, np.arange(20, 80, 2)
+    signal = _sinusoid(33.3, n=700, seed=1) + _sinusoid(55.0, n=700, amplitude=1.0, seed=2)
+    tracker = GoertzelTracker(window, periods, resync=50)
+    for t, value in enumerate(signal):
+        cycle = tracker.update(value)
+        if t < window - 1:
+            assert cycle is None
+            continue
+        expected = band_cycle(signal[t - window + 1:t + 1], periods)
+        for key in ('period', 'amplitude', 'confidence'):
+            assert cycle[key] == pytest.approx(expected[key], rel=1e-6, abs=1e-9), (t, key)
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from indicators import rolling_means
+from synthetic import synthetic_ohlcv
+
+
+def test_rolling_means_match_pandas_with_gaps():
+    values = synthetic_ohlcv(2000)['Volume'].to_numpy(dtype=float)
+    values[[0, 700, 701, 1500]] = np.nan
+    means = rolling_means(values, (14, 50))
+    for window in (14, 50):
+        expected = pd.Series(values).rolling(window).mean().to_numpy()
+        np.testing.assert_allclose(means[window], expected, rtol=1e-10)
+
+
+def test_rolling_means_panel_columns_match_pandas():
+    panel = np.stack([synthetic_ohlcv(1000, seed=i)['Close'].to_numpy() for i in range(4)], axis=1)
+    panel[:300, 1] = np.nan
+    panel[600, 2] = np.nan
+    means = rolling_means(panel, (50, 200))
+    for window in (50, 200):
+        expected = pd.DataFrame(panel).rolling(window).mean().to_numpy()
+        np.testing.assert_allclose(means[window], expected, rtol=1e-10)
@@ -0,0 +1,65 @@
+import json
+import os
+import pickle
+import subprocess
+import sys
+
+from instrumentation import StageRecorder
+from market_data import MarketDataCache
+from pipeline import run_pipeline
+from synthetic import synthetic_ohlcv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_stage_record_has_timing_rows_and_memory_fields():
+    recorder = StageRecorder(run_id='run1', trace_memory=True, symbol='CL=F')
+    with recorder.stage('allocate', rows=1000) as record:
+        record['extra'] = 1
+        buffer = bytearray(8 << 20)
+    del buffer
+    [record] = recorder.records
+    assert record['run_id'] == 'run1' and record['stage'] == 'allocate' and record['symbol'] == 'CL=F'
+    assert record['rows'] == 1000 and record['extra'] == 1
+    assert record['wall_seconds'] >= 0 and record['cpu_seconds'] >= 0
+    assert isinstance(record['memory_delta_bytes'], int)
+    assert record['traced_peak_bytes'] >= 8 << 20
+    assert pickle.loads(pickle.dumps(recorder.records)) == recorder.records
+    assert recorder.summary()['allocate']['rows'] == 1000
+
+
+def _cached_symbols(cache_dir, symbols):
+    cache = MarketDataCache(cache_dir)
+    for seed, symbol in enumerate(symbols):
+        cache.store(symbol, '1h', synthetic_ohlcv(2000, seed=seed))
+
+
+def test_worker_records_come_back_through_the_pool(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    _cached_symbols(cache_dir, ['CL=F', 'NG=F'])
+    report = run_pipeline(['CL=F', 'NG=F'], workers=2, period='max', cache_dir=cache_dir, offline=True,
+                          output=str(tmp_path / 'out.parquet'))
+    assert not report['failures']
+    worker_stages = [record for record in report['stages'] if 'symbol' in record]
+    assert {record['symbol'] for record in worker_stages} == {'CL=F', 'NG=F'}
+    for symbol in ('CL=F', 'NG=F'):
+        stages = [record['stage'] for record in worker_stages if record['symbol'] == symbol]
+        assert stages == ['download', 'moving_averages', 'volume_oscillator', 'fft_high_amplitude', 'wyckoff',
+                          'signals']
+    assert len({record['run_id'] for record in report['stages']}) == 1
+    assert report['stage_summary']['download']['calls'] == 2
+
+
+def test_stage_log_flag_appends_json_lines(tmp_path):
+    cache_dir, log = str(tmp_path / 'cache'), str(tmp_path / 'stages.jsonl')
+    _cached_symbols(cache_dir, ['CL=F'])
+    command = [sys.executable, 'pipeline.py', 'CL=F', '--workers', '1', '--period', 'max', '--offline',
+               '--cache-dir', cache_dir, '--output', str(tmp_path / 'out.parquet'), '--stage-log', log]
+    for _ in range(2):
+        subprocess.run(command, cwd=ROOT, check=True, capture_output=True)
+    with open(log) as handle:
+        records = [json.loads(line) for line in handle]
+    # Per run: the download, five analysis stages and the write
+    assert len(records) == 14
+    assert len({record['run_id'] for record in records}) == 2
+    assert all('wall_seconds' in record for record in records)
@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+
+from live_service import ListSink, ReplaySource, SignalService
+from synthetic import synthetic_ohlcv
+
+
+class FailingSink:
+    def __init__(self, fail_after):
+        self.fail_after = fail_after
+        self.published = 0
+
+    async def publish(self, event):
+        if self.published >= self.fail_after:
+            raise OSError('sink down')
+        self.published += 1
+
+
+def _frames(symbols=3, bars=2000):
+    return {f'S{i}': synthetic_ohlcv(bars, seed=i) for i in range(symbols)}
+
+
+def test_service_publishes_signal_changes_for_every_symbol():
+    sink = ListSink()
+    stats = asyncio.run(SignalService(sink, fft_hop=8).run(ReplaySource(_frames())))
+    assert stats['bars'] == 6000 and stats['symbols'] == 3
+    assert sink.events and {event['signal'] for event in sink.events} <= {'Buy', 'Sell'}
+
+
+@pytest.mark.parametrize('queue_size', [1, 1000])
+def test_sink_failure_is_raised_instead_of_hanging(queue_size):
+    service = SignalService(FailingSink(fail_after=2), queue_size=queue_size, fft_hop=8)
+    with pytest.raises(OSError, match='sink down'):
+        asyncio.run(asyncio.wait_for(service.run(ReplaySource(_frames())), timeout=60))
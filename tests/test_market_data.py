@@ -0,0 +1,74 @@
+import sys
+import types
+
+import pandas as pd
+
+import market_data
+from market_data import MarketDataCache
+from synthetic import synthetic_ohlcv
+
+
+# The default provider must go to yfinance (stubbed here), not back into the cache wrapper
+def test_default_provider_calls_yfinance(tmp_path, monkeypatch):
+    calls = []
+    bars = synthetic_ohlcv(100)
+
+    def download(symbol, **kwargs):
+        calls.append((symbol, kwargs))
+        return bars
+
+    monkeypatch.setitem(sys.modules, 'yfinance', types.SimpleNamespace(download=download))
+    data = MarketDataCache(str(tmp_path)).download('CL=F', period='3mo', interval='1h')
+
+    assert calls and calls[0][0] == 'CL=F'
+    assert calls[0][1]['auto_adjust'] is False and calls[0][1]['interval'] == '1h'
+    assert len(data) == len(bars)
+    pd.testing.assert_series_equal(data['Close'], bars['Close'], check_names=False, check_freq=False)
+
+
+# Serves slices of one synthetic history and records every requested range
+class RecordingProvider:
+    def __init__(self, bars):
+        self.bars = bars
+        self.calls = []
+
+    def __call__(self, symbol, interval, start=None, end=None, period=None):
+        self.calls.append((market_data._as_timestamp(start, 'UTC'), market_data._as_timestamp(end, 'UTC')))
+        return market_data._window(self.bars, start=start, end=end, period=period)
+
+
+def test_refresh_fetches_only_ranges_the_cache_has_not_covered(tmp_path):
+    bars = synthetic_ohlcv(24 * 40)
+    provider = RecordingProvider(bars)
+    cache = MarketDataCache(str(tmp_path), provider)
+    utc = lambda value: pd.Timestamp(value, tz='UTC')
+
+    cache.download('CL=F', interval='1h', start='2010-01-05', end='2010-01-20')
+    assert provider.calls == [(utc('2010-01-05'), utc('2010-01-20'))]
+    # A fixed past end inside the covered range is served from the cache
+    cache.download('CL=F', interval='1h', start='2010-01-05', end='2010-01-20')
+    cache.download('CL=F', interval='1h', start='2010-01-08', end='2010-01-12')
+    assert len(provider.calls) == 1
+
+    # An earlier start is backfilled once, up to the first cached bar
+    cache.download('CL=F', interval='1h', start='2010-01-03', end='2010-01-20')
+    assert provider.calls[1] == (utc('2010-01-03'), utc('2010-01-05'))
+    cache.download('CL=F', interval='1h', start='2010-01-03', end='2010-01-20')
+    assert len(provider.calls) == 2
+
+    # A later end re-fetches from the last cached bar
+    data = cache.download('CL=F', interval='1h', start='2010-01-03', end='2010-01-25')
+    assert provider.calls[2] == (utc('2010-01-19 23:00'), utc('2010-01-25'))
+    expected = market_data._normalize(bars[(bars.index >= utc('2010-01-03')) & (bars.index < utc('2010-01-25'))])
+    pd.testing.assert_frame_equal(data, expected, check_freq=False, check_index_type=False)
+    pd.testing.assert_frame_equal(cache.load('CL=F', '1h'), expected, check_freq=False, check_index_type=False)
+
+
+def test_offline_switch_serves_the_cache_without_the_provider(tmp_path, monkeypatch):
+    bars = synthetic_ohlcv(100)
+    provider = RecordingProvider(bars)
+    cache = MarketDataCache(str(tmp_path), provider)
+    cache.download('CL=F', interval='1h', period='max')
+    monkeypatch.setattr(market_data, 'OFFLINE', True)
+    data = market_data.download('CL=F', interval='1h', period='max', cache=cache)
+    assert len(provider.calls) == 1 and len(data) == 100
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from oscillators import EMAState, MACDState, RSIState, ema, macd, rsi
+from synthetic import synthetic_ohlcv
+
+
+def _ta_rsi(close, window=14):
+    diff = close.diff(1)
+    up = diff.where(diff > 0, 0.0).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    down = (-diff.where(diff < 0, 0.0)).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    return np.where(down == 0, 100, 100 - 100 / (1 + up / down))
+
+
+def _ta_macd(close):
+    line = (close.ewm(span=12, min_periods=12, adjust=False).mean()
+            - close.ewm(span=26, min_periods=26, adjust=False).mean())
+    return line, line.ewm(span=9, min_periods=9, adjust=False).mean()
+
+
+@pytest.mark.parametrize('alpha', [0.5, 0.3, 1 / 14])
+@pytest.mark.parametrize('min_periods', [1, 3])
+def test_ema_matches_pandas_with_gaps(alpha, min_periods):
+    values = np.array([np.nan, 1, 2, 3, np.nan, 5, 6, 7, np.nan, np.nan, 4, 2, np.nan])
+    expected = pd.Series(values).ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean().to_numpy()
+    np.testing.assert_allclose(ema(values, alpha, min_periods), expected)
+    state = EMAState(alpha, min_periods)
+    np.testing.assert_allclose([state.update(v) for v in values], expected)
+
+
+def test_ema_panel_mixes_clean_and_gappy_columns():
+    panel = np.stack([synthetic_ohlcv(500, seed=i)['Close'].to_numpy() for i in range(3)], axis=1)
+    panel[:50, 1] = np.nan
+    panel[[200, 201, 350], 2] = np.nan
+    expected = pd.DataFrame(panel).ewm(alpha=0.1, adjust=False, min_periods=10).mean().to_numpy()
+    np.testing.assert_allclose(ema(panel, 0.1, min_periods=10, axis=0), expected)
+
+
+def test_rsi_and_macd_match_ta_formulas():
+    close = synthetic_ohlcv(3000)['Close']
+    np.testing.assert_allclose(rsi(close), _ta_rsi(close))
+    line, signal, _ = macd(close)
+    expected_line, expected_signal = _ta_macd(close)
+    np.testing.assert_allclose(line, expected_line)
+    np.testing.assert_allclose(signal, expected_signal)
+
+
+def test_rsi_recovers_after_a_gap_and_streams_identically():
+    close = synthetic_ohlcv(1000)['Close'].to_numpy().copy()
+    close[[400, 401, 700]] = np.nan
+    values = rsi(close)
+    assert np.isfinite(values[13:]).all()
+    state = RSIState()
+    np.testing.assert_allclose([state.update(c) for c in close], values, atol=1e-9)
+    macd_state = MACDState()
+    streamed = np.array([macd_state.update(c) for c in close])
+    np.testing.assert_allclose(streamed[:, 1], macd(close)[1], atol=1e-9)
@@ -0,0 +1,21 @@
+import numpy as np
+
+from indicators import moving_averages, normalized_volume_oscillator, volume_oscillator
+from panel import build_panel, panel_indicator_frames
+from synthetic import synthetic_ohlcv
+from wyckoff import wyckoff_method
+
+
+def test_panel_matches_per_symbol_pandas():
+    frames = {f'S{seed}': synthetic_ohlcv(1200, seed=seed) for seed in range(4)}
+    # Late listing and a missing bar: warm-up restarts per column
+    frames['S1'] = frames['S1'].iloc[300:]
+    frames['S2'].iloc[500, frames['S2'].columns.get_loc('Volume')] = np.nan
+    results = panel_indicator_frames(build_panel(frames, 'Close'), build_panel(frames, 'Volume'))
+    for symbol, frame in frames.items():
+        expected = wyckoff_method(normalized_volume_oscillator(volume_oscillator(moving_averages(frame.copy()))))
+        for column in ['50_MA', '200_MA', 'Short_Vol_MA', 'Long_Vol_MA', 'Vol_Osc', 'VolOsc', 'VolOscNorm']:
+            actual = results[column][symbol].reindex(frame.index)
+            assert np.allclose(actual, expected[column], rtol=1e-9, equal_nan=True), (symbol, column)
+        phases = results['Phase'][symbol].reindex(frame.index).astype(str)
+        assert (phases == expected['Phase'].astype(str)).all(), symbol
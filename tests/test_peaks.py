@@ -0,0 +1,35 @@
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.signal import find_peaks
+
+from indicators import normalized_volume_oscillator
+from peaks import forward_changes, label_peaks, movement_codes, peak_types
+from synthetic import synthetic_ohlcv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_label_peaks_reproduces_volume_oscillation_analysis_csv():
+    expected = pd.read_csv(os.path.join(ROOT, 'volume_oscillation_analysis.csv'), index_col=0)
+    labelled = label_peaks(expected.drop(columns=['VolOsc_Peak', 'Price_Movement']))
+    for column in ['VolOsc_Peak', 'Price_Movement']:
+        assert (labelled[column].fillna('') == expected[column].fillna('')).all(), column
+
+
+def test_panel_rows_match_per_symbol_find_peaks():
+    frames = [normalized_volume_oscillator(synthetic_ohlcv(1500, seed=seed)) for seed in range(4)]
+    values = np.stack([frame['VolOscNorm'].fillna(0).to_numpy() for frame in frames])
+    close = np.stack([frame['Close'].to_numpy() for frame in frames])
+    types = peak_types(values)
+    moves = movement_codes(types[None], forward_changes(close, horizons=(1, 5)))
+    for row, frame in enumerate(frames):
+        tops, _ = find_peaks(values[row], distance=10)
+        bottoms, _ = find_peaks(-values[row], distance=10)
+        assert np.array_equal(np.flatnonzero(types[row] == 1), tops)
+        assert np.array_equal(np.flatnonzero(types[row] == -1), bottoms)
+        # 5-bar move after each bottom, as the scripts' shift(-horizon) comparison would label it
+        change = (frame['Close'].shift(-5) - frame['Close']).to_numpy()[bottoms]
+        expected = np.where(np.isnan(change), 0, np.where(change > 0, 1, -1))
+        assert np.array_equal(moves[1, row, bottoms], expected)
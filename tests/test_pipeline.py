@@ -0,0 +1,26 @@
+import pandas as pd
+
+from pipeline import run_pipeline
+from synthetic import synthetic_ohlcv
+
+
+# Serves synthetic bars for every symbol except BAD, which fails like an unreachable feed
+class StubProvider:
+    def __call__(self, symbol, interval, start=None, end=None, period=None):
+        if symbol == 'BAD':
+            raise ConnectionError('feed unavailable')
+        return synthetic_ohlcv(3000, seed=len(symbol))
+
+
+def test_failing_symbol_is_isolated_and_output_is_keyed_by_symbol(tmp_path):
+    output = str(tmp_path / 'results.parquet')
+    report = run_pipeline(['CL=F', 'BAD'], workers=2, period='max', cache_dir=str(tmp_path / 'cache'),
+                          provider=StubProvider(), output=output)
+    assert list(report['results']) == ['CL=F']
+    assert list(report['failures']) == ['BAD'] and 'feed unavailable' in report['failures']['BAD']
+
+    combined = pd.read_parquet(output)
+    assert combined.index.names[0] == 'Symbol'
+    assert set(combined.index.get_level_values('Symbol')) == {'CL=F'}
+    assert len(combined.loc['CL=F']) == 3000
+    assert {'Vol_Osc', 'Significant', 'Phase', 'Signal'} <= set(combined.columns)
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+import reporting
+from reporting import lttb_indices, minmax_indices, render_symbol
+from synthetic import synthetic_ohlcv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_save_mode_writes_pngs_and_closes_figures(tmp_path, monkeypatch):
+    monkeypatch.setattr(reporting, 'PLOT_MODE', 'save')
+    monkeypatch.setattr(reporting, 'PLOT_DIR', str(tmp_path))
+    plt.figure()
+    plt.plot([1, 2, 3])
+    reporting.show('prices')
+    assert (tmp_path / 'prices.png').stat().st_size > 0
+    assert plt.get_fignums() == []
+
+
+def test_off_mode_disables_plotting_before_any_figure_is_built():
+    code = 'import reporting, matplotlib; print(reporting.PLOTTING, matplotlib.get_backend())'
+    env = {**os.environ, 'PLOT_MODE': 'off'}
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env, capture_output=True, text=True,
+                            check=True).stdout.split()
+    assert output[0] == 'False' and output[1].lower() == 'agg'
+
+
+def test_minmax_decimation_keeps_endpoints_and_extremes():
+    values = np.random.default_rng(0).normal(size=100_000)
+    values[[12_345, 67_890]] = [50.0, -50.0]
+    keep = minmax_indices(values, 500)
+    assert keep[0] == 0 and keep[-1] == len(values) - 1
+    assert {12_345, 67_890} <= set(keep.tolist())
+    assert len(keep) <= 2 * 500 + 2 and (np.diff(keep) > 0).all()
+    assert np.array_equal(minmax_indices(values[:100], 500), np.arange(100))
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    y = np.sin(np.linspace(0, 20, 50_000))
+    y[30_000] = 10.0
+    x = np.arange(len(y))
+    keep = lttb_indices(x, y, 1000)
+    assert len(keep) == 1000
+    assert keep[0] == 0 and keep[-1] == len(y) - 1
+    assert 30_000 in keep and (np.diff(keep) > 0).all()
+    assert np.array_equal(lttb_indices(x[:10], y[:10], 1000), np.arange(10))
+
+
+def test_render_symbol_writes_both_charts(tmp_path):
+    data = synthetic_ohlcv(5000)
+    data['Phase'] = np.resize(['Markup', 'Markdown', 'Accumulation', 'Distribution'], len(data))
+    data['Signal'] = np.resize(['Buy', None, None, 'Sell'], len(data))
+    data['Vol_Osc'] = data['Volume'].rolling(14).mean().pct_change()
+    data['Significant'] = pd.Series(np.sin(np.arange(len(data)) / 20), index=data.index)
+    paths = render_symbol(data, 'CL=F', out_dir=str(tmp_path), max_points=1000)
+    assert [os.path.basename(path) for path in paths] == ['CL_F_phases.png', 'CL_F_vol_osc.png']
+    assert all(os.path.getsize(path) > 0 for path in paths)
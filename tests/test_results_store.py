@@ -0,0 +1,138 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import results_store
+from results_store import IncrementalResults
+from synthetic import synthetic_ohlcv
+
+
+def _results(n=300, seed=0):
+    data = synthetic_ohlcv(n, seed=seed)
+    data['Phase'] = np.resize(['Markup', 'Markdown', 'Unknown'], n)
+    return data
+
+
+def _assert_read_matches(store, data):
+    stored = store.read('signals', 'CL=F')
+    pd.testing.assert_frame_equal(stored, results_store.compact(data), check_freq=False, check_index_type=False)
+
+
+def test_only_new_bars_are_written_and_unchanged_reruns_write_nothing(tmp_path):
+    store = IncrementalResults(str(tmp_path))
+    data = _results()
+    assert store.write('signals', 'CL=F', data.iloc[:200]) == 200
+    assert store.write('signals', 'CL=F', data.iloc[:200]) == 0
+    assert store.manifest('signals', 'CL=F')['segments'] == ['part-000000.parquet']
+
+    assert store.write('signals', 'CL=F', data) == 100
+    manifest = store.manifest('signals', 'CL=F')
+    assert len(manifest['segments']) == 2 and manifest['rows'] == 300
+    assert pd.Timestamp(manifest['last_timestamp']) == data.index[-1]
+    second = results_store.read_results(os.path.join(tmp_path, 'signals', 'symbol=CL=F', manifest['segments'][1]))
+    assert (second.index == data.index[200:]).all()
+    _assert_read_matches(store, data)
+
+
+def test_revised_bar_inside_the_window_is_rewritten_and_wins(tmp_path):
+    store = IncrementalResults(str(tmp_path), revision_window=24)
+    data = _results()
+    store.write('signals', 'CL=F', data)
+    revised = data.copy()
+    revised.iloc[-3, revised.columns.get_loc('Close')] += 1.0
+    revised.iloc[-2, revised.columns.get_loc('Phase')] = 'Distribution'
+    # A change older than the revision window is treated as final and ignored
+    revised.iloc[-100, revised.columns.get_loc('Close')] += 1.0
+    assert store.write('signals', 'CL=F', revised) == 2
+    expected = revised.copy()
+    expected.iloc[-100, expected.columns.get_loc('Close')] = data['Close'].iloc[-100]
+    _assert_read_matches(store, expected)
+
+
+def test_consolidate_keeps_the_result(tmp_path):
+    store = IncrementalResults(str(tmp_path))
+    data = _results()
+    for stop in (100, 200, 300):
+        store.write('signals', 'CL=F', data.iloc[:stop])
+    before = store.read('signals', 'CL=F')
+    store.consolidate('signals', 'CL=F')
+    segments = store.manifest('signals', 'CL=F')['segments']
+    assert segments == ['part-000003.parquet']
+    assert sorted(os.listdir(os.path.join(tmp_path, 'signals', 'symbol=CL=F'))) == ['_manifest.json'] + segments
+    pd.testing.assert_frame_equal(store.read('signals', 'CL=F'), before)
+
+
+@pytest.mark.parametrize('failing', ['segment', 'manifest'])
+def test_failed_write_leaves_manifest_and_segments_consistent(tmp_path, monkeypatch, failing):
+    store = IncrementalResults(str(tmp_path))
+    data = _results()
+    store.write('signals', 'CL=F', data.iloc[:200])
+    manifest = store.manifest('signals', 'CL=F')
+
+    def fail(*args, **kwargs):
+        raise OSError('disk full')
+
+    if failing == 'segment':
+        monkeypatch.setattr(pd.DataFrame, 'to_parquet', fail)
+    else:
+        monkeypatch.setattr(results_store.json, 'dump', fail)
+    with pytest.raises(OSError):
+        store.write('signals', 'CL=F', data)
+    monkeypatch.undo()
+
+    with open(os.path.join(tmp_path, 'signals', 'symbol=CL=F', '_manifest.json')) as handle:
+        assert json.load(handle) == manifest
+    _assert_read_matches(store, data.iloc[:200])
+    # The next run writes the same bars again, replacing any unlisted segment
+    assert store.write('signals', 'CL=F', data) == 100
+    _assert_read_matches(store, data)
+
+
+@pytest.mark.parametrize('suffix', ['parquet', 'feather'])
+def test_write_results_round_trip_with_categoricals_and_projection(tmp_path, suffix):
+    data = _results()
+    data['Signal'] = np.resize(['Buy', None, 'Sell'], len(data))
+    path = results_store.write_results(data, str(tmp_path / f'signals.{suffix}'))
+    stored = results_store.read_results(path)
+    assert isinstance(stored['Phase'].dtype, pd.CategoricalDtype)
+    assert isinstance(stored['Signal'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(stored, results_store.compact(data), check_freq=False, check_index_type=False,
+                                  check_names=False)
+    projected = results_store.read_results(path, columns=['Close', 'Phase'])
+    assert list(projected.columns) == ['Close', 'Phase']
+    assert (projected.index == data.index).all()
+
+
+def test_float32_option_halves_float_columns(tmp_path):
+    data = _results()
+    stored = results_store.read_results(results_store.write_results(data, str(tmp_path / 'a.parquet'), float32=True))
+    assert (stored.dtypes[['Open', 'Close', 'Adj Close']] == np.float32).all()
+    assert stored['Volume'].dtype == np.int64
+    np.testing.assert_allclose(stored['Close'], data['Close'], rtol=1e-6)
+
+
+def test_results_store_filters_by_symbol_and_run(tmp_path):
+    store = results_store.ResultsStore(str(tmp_path))
+    seeds = {('CL=F', 'r1'): 1, ('CL=F', 'r2'): 2, ('NG=F', 'r1'): 3, ('NG=F', 'r2'): 4}
+    for (symbol, run), seed in seeds.items():
+        store.append('signals', _results(50, seed=seed), symbol, run_id=run)
+    everything = store.read('signals')
+    assert len(everything) == 200
+    selected = store.read('signals', columns=['Close', 'Phase'], symbols=['NG=F'], runs=['r2'])
+    assert len(selected) == 50
+    assert list(selected.columns) == ['Close', 'Phase']
+    np.testing.assert_array_equal(selected['Close'].to_numpy(), _results(50, seed=4)['Close'].to_numpy())
+    assert set(store.read('signals', symbols=['CL=F'])['symbol'].astype(str)) == {'CL=F'}
+
+
+def test_convert_csv_matches_the_source(tmp_path):
+    source = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'wyckoff_analysis.csv')
+    path = results_store.convert_csv(source, str(tmp_path / 'wyckoff_analysis.parquet'))
+    expected = pd.read_csv(source, index_col=0)
+    stored = results_store.read_results(path)
+    assert len(stored) == len(expected) and str(stored.index.tz) == 'UTC'
+    assert (stored['Phase'].astype(str).to_numpy() == expected['Phase'].to_numpy()).all()
+    np.testing.assert_array_equal(stored['Close'].to_numpy(), expected['Close'].to_numpy())
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from numpy.fft import fft, ifft
+from scipy.fft import next_fast_len, rfft
+from scipy.signal import welch
+
+from indicators import oscillator_array, volume_oscillator
+from spectral import (SlidingSpectrum, SpectralEngine, WelchAccumulator, causal_high_amplitude_series,
+                      high_amplitude_series, reconstruct, select_bins, welch_spectrum)
+from synthetic import synthetic_ohlcv
+
+
+def _oscillator(n, seed=0):
+    return oscillator_array(volume_oscillator(synthetic_ohlcv(n, seed=seed)))
+
+
+# The scripts' loop: one full inverse FFT per high-amplitude bin
+def _loop_series(signal, percentile=90):
+    fft_values = fft(signal)
+    amplitudes = np.abs(fft_values)
+    high_amp_indices = np.where(amplitudes > np.percentile(amplitudes, percentile))[0]
+    series = np.zeros_like(signal, dtype=float)
+    for idx in high_amp_indices:
+        series += np.real(ifft(fft_values * (np.arange(len(fft_values)) == idx)))
+    return series
+
+
+@pytest.mark.parametrize('n', [1000, 1001])
+def test_single_inverse_transform_matches_the_per_bin_loop(n):
+    signal = _oscillator(n)
+    assert np.allclose(high_amplitude_series(signal, percentile=90), _loop_series(signal, 90), atol=1e-9)
+
+
+@pytest.mark.parametrize('window', [64, 65])
+def test_sliding_spectrum_matches_a_fresh_rfft_of_each_window(window):
+    signal = _oscillator(600, seed=1)
+    spectrum = SlidingSpectrum(window, resync=10**9)
+    for t, value in enumerate(signal):
+        significant = spectrum.update(value)
+        if t < window - 1:
+            assert np.isnan(significant)
+            continue
+        expected_spectrum = rfft(signal[t - window + 1:t + 1])
+        assert np.allclose(spectrum.spectrum, expected_spectrum, atol=1e-6)
+        mask = select_bins(expected_spectrum, window, percentile=90)
+        assert significant == pytest.approx(reconstruct(expected_spectrum, mask, window)[-1], abs=1e-6)
+
+
+def test_causal_series_never_looks_ahead():
+    signal = _oscillator(400, seed=2)
+    full = causal_high_amplitude_series(signal, 128)
+    truncated = causal_high_amplitude_series(signal[:300], 128)
+    assert np.array_equal(full[:300], truncated, equal_nan=True)
+
+
+def test_welch_accumulator_is_proportional_to_scipy_welch():
+    signal = _oscillator(20_000, seed=3)
+    accumulator = welch_spectrum(signal, segment=1024)
+    frequencies, density = welch(signal, window=np.hanning(1024), nperseg=1024, noverlap=512, detrend='constant')
+    assert np.allclose(accumulator.frequencies, frequencies)
+    ratio = accumulator.amplitudes[1:-1] ** 2 / density[1:-1]
+    assert np.allclose(ratio, ratio[0], rtol=1e-9)
+
+
+def test_chunked_feeding_matches_one_call():
+    signal = _oscillator(20_000, seed=4)
+    whole = WelchAccumulator(segment=1024).update(signal)
+    # Chunk sizes that split segments and overlaps at every boundary
+    chunked = WelchAccumulator(segment=1024, batch=3)
+    for start in range(0, len(signal), 777):
+        chunked.update(signal[start:start + 777])
+    assert chunked.count == whole.count
+    assert np.allclose(chunked.power, whole.power, rtol=1e-12)
+    assert np.allclose(welch_spectrum(signal, segment=1024, chunk_size=1000).power, whole.power, rtol=1e-12)
+
+
+def test_welch_spectrum_reads_a_memmap(tmp_path):
+    signal = _oscillator(20_000, seed=5)
+    path = str(tmp_path / 'vol_osc.bin')
+    signal.tofile(path)
+    mapped = np.memmap(path, dtype=np.float64, mode='r', shape=signal.shape)
+    spectrum = welch_spectrum(mapped, segment=1024, chunk_size=4096)
+    assert np.allclose(spectrum.power, welch_spectrum(signal, segment=1024).power, rtol=1e-12)
+
+
+@pytest.mark.parametrize('pad', [False, True])
+def test_spectral_engine_rows_match_the_single_series_path(pad):
+    windows = np.stack([_oscillator(1500, seed=seed)[-1009:] for seed in range(6)])
+    result = SpectralEngine(pad=pad).scan(windows, reconstruct_series=True)
+    n = next_fast_len(1009, real=True) if pad else 1009
+    assert result['significant'].shape == windows.shape
+    for row, window in enumerate(windows):
+        spectrum = rfft(window, n)
+        mask = select_bins(spectrum, n, percentile=90)
+        assert np.array_equal(result['mask'][row], mask)
+        assert np.allclose(result['significant'][row], reconstruct(spectrum, mask, n)[:1009])
+        peak = 1 + np.argmax(np.abs(spectrum[1:]))
+        assert result['dominant_frequency'][row] == np.fft.rfftfreq(n)[peak]
+        assert result['dominant_amplitude'][row] == pytest.approx(np.abs(spectrum[peak]))
+        if not pad:
+            assert np.allclose(result['significant'][row], high_amplitude_series(window, percentile=90))
+
+
+def test_spectral_engine_top_k_masks():
+    windows = np.stack([_oscillator(1024, seed=seed) for seed in range(3)])
+    mask = SpectralEngine(top_k=5).scan(windows)['mask']
+    assert (mask.sum(axis=1) == 5).all()
+    for row, window in enumerate(windows):
+        assert np.array_equal(mask[row], select_bins(rfft(window), 1024, top_k=5))
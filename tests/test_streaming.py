@@ -0,0 +1,17 @@
+import numpy as np
+
+from indicators import moving_averages, volume_oscillator
+from streaming import run_engine
+from synthetic import synthetic_ohlcv
+from wyckoff import wyckoff_method
+
+
+def test_engine_matches_the_batch_pandas_path_bar_for_bar():
+    data = synthetic_ohlcv(3000, seed=3)
+    data.iloc[[700, 701, 1500], data.columns.get_loc('Volume')] = np.nan
+    data.iloc[1200, data.columns.get_loc('Close')] = np.nan
+    batch = wyckoff_method(volume_oscillator(moving_averages(data.copy())))
+    streamed = run_engine(data)
+    for column in ['50_MA', '200_MA', 'Short_Vol_MA', 'Long_Vol_MA', 'Vol_Osc']:
+        assert np.allclose(streamed[column], batch[column], rtol=1e-9, equal_nan=True), column
+    assert (streamed['Phase'] == batch['Phase'].astype(str)).all()
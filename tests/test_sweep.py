@@ -0,0 +1,16 @@
+import numpy as np
+
+from backtest import BARS_PER_YEAR
+from sweep import parameter_sweep
+from synthetic import synthetic_ohlcv
+
+
+def test_sweep_grid_survives_a_missing_volume_bar():
+    data = synthetic_ohlcv(2000)
+    data['Volume'] = data['Volume'].astype(float)
+    data.iloc[1000, data.columns.get_loc('Volume')] = np.nan
+    grid = parameter_sweep(data, short_periods=range(5, 8), long_periods=range(20, 26, 2),
+                           fft_percentiles=(80, 90), periods_per_year=BARS_PER_YEAR['1h'])
+    assert len(grid) == 3 * 3 * 2
+    assert np.isfinite(grid['sharpe']).all()
+    assert (grid['trades'] > 0).all()
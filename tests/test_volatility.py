@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from volatility import GarchVolatility, KalmanVolatility
+
+PARAMS = {'mu': 0.0, 'omega': 1e-6, 'alpha[1]': 0.05, 'beta[1]': 0.9}
+
+
+def _model():
+    state = {'sigma2': 1e-4, 'resid': 0.0, 'bars_since_fit': 0, 'z2_sum': 0.0, 'z2_count': 0}
+    return GarchVolatility(params=dict(PARAMS), state=state, refit_every=10**9, min_drift_bars=10**9)
+
+
+def test_refresh_without_new_bars_is_a_no_op():
+    returns = pd.Series(np.random.default_rng(0).normal(0, 0.01, 3000))
+    model = _model()
+    before = dict(model.state)
+    assert len(model.refresh(returns, 0)) == 0
+    assert len(model.refresh(returns.to_numpy(), 0)) == 0
+    assert model.state == before
+
+
+def test_refresh_updates_only_the_new_tail():
+    returns = pd.Series(np.random.default_rng(0).normal(0, 0.01, 3000))
+    stepwise, batch = _model(), _model()
+    stepwise.update(returns[:2990])
+    out = stepwise.refresh(returns, 10)
+    expected = batch.update(returns)[-10:]
+    assert out.index.equals(returns.index[-10:])
+    np.testing.assert_allclose(out, expected)
+    assert stepwise.state['bars_since_fit'] == 3000
+
+
+# Returns whose log-variance follows a known Gaussian random walk with step `sigma`
+def _stochastic_volatility(n=5000, sigma=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    log_variance = np.log(1e-4) + np.cumsum(rng.normal(0, sigma, n))
+    return np.exp(log_variance / 2) * rng.normal(size=n), log_variance
+
+
+def test_kalman_recovers_a_random_walk_log_variance():
+    returns, log_variance = _stochastic_volatility()
+    model = KalmanVolatility()
+    estimate = model.fit(returns)
+    assert model.sigma == pytest.approx(0.05, rel=0.3)
+    assert np.corrcoef(estimate, log_variance)[0, 1] > 0.95
+    assert np.sqrt(np.mean((estimate - log_variance) ** 2)) < 0.25 * log_variance.std()
+
+
+def test_kalman_treats_zero_returns_as_missing():
+    returns, _ = _stochastic_volatility(n=2000)
+    zeros, missing = returns.copy(), returns.copy()
+    zeros[500:520] = 0.0
+    missing[500:520] = np.nan
+    with_zeros = KalmanVolatility(sigma=0.05).fit(zeros)
+    assert np.isfinite(with_zeros).all()
+    np.testing.assert_allclose(with_zeros, KalmanVolatility(sigma=0.05).fit(missing))
+    # No observation: the filter only predicts, so the level is carried through the gap
+    model = KalmanVolatility(sigma=0.05)
+    model.fit(zeros[:510])
+    before = model.state['h']
+    model.update(zeros[510:515])
+    assert model.state['h'] == before
+
+
+def test_saved_kalman_state_continues_like_one_run(tmp_path):
+    returns, _ = _stochastic_volatility(n=3000)
+    full = KalmanVolatility(sigma=0.05)
+    full_estimate = full.fit(returns)
+
+    first = KalmanVolatility(sigma=0.05)
+    first.fit(returns[:2000])
+    path = str(tmp_path / 'kalman.json')
+    first.save(path)
+    resumed = KalmanVolatility.load(path)
+    tail = resumed.update(returns[2000:])
+
+    assert resumed.sigma == 0.05
+    assert resumed.state == pytest.approx(full.state)
+    # The last bar has no future data, so filtered and smoothed values agree with the full run
+    assert tail[-1] == pytest.approx(full_estimate[-1])
+    assert len(tail) == 1000
@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from indicators import moving_averages
+from synthetic import synthetic_ohlcv
+from wyckoff import classify_phase, wyckoff_method
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# The per-row iloc loop the scripts used before wyckoff_method was vectorized (bars it leaves
+# unset are Unknown)
+def _loop_wyckoff(data):
+    data['Phase'] = 'Unknown'
+    for i in range(len(data)):
+        if data['50_MA'].iloc[i] > data['200_MA'].iloc[i]:
+            if data['Close'].iloc[i] < data['50_MA'].iloc[i] and data['Close'].iloc[i] > data['200_MA'].iloc[i]:
+                data.loc[data.index[i], 'Phase'] = 'Distribution'
+            elif data['Close'].iloc[i] > data['50_MA'].iloc[i]:
+                data.loc[data.index[i], 'Phase'] = 'Markup'
+            elif data['Close'].iloc[i] < data['200_MA'].iloc[i]:
+                data.loc[data.index[i], 'Phase'] = 'Markdown'
+        elif data['50_MA'].iloc[i] < data['200_MA'].iloc[i]:
+            if data['Close'].iloc[i] < data['50_MA'].iloc[i] and data['Close'].iloc[i] > data['200_MA'].iloc[i]:
+                data.loc[data.index[i], 'Phase'] = 'Accumulation'
+            elif data['Close'].iloc[i] > data['50_MA'].iloc[i]:
+                data.loc[data.index[i], 'Phase'] = 'Markup'
+            elif data['Close'].iloc[i] < data['200_MA'].iloc[i]:
+                data.loc[data.index[i], 'Phase'] = 'Markdown'
+    return data
+
+
+def test_vectorized_phases_reproduce_wyckoff_analysis_csv():
+    expected = pd.read_csv(os.path.join(ROOT, 'wyckoff_analysis.csv'), index_col=0)
+    data = moving_averages(expected[['Close']].copy())
+    assert np.allclose(data['50_MA'], expected['50_MA'], equal_nan=True)
+    phases = wyckoff_method(data)['Phase'].astype(str)
+    assert (phases == expected['Phase']).all()
+
+
+def test_vectorized_and_scalar_phases_match_the_loop():
+    data = moving_averages(synthetic_ohlcv(3000, seed=4)[['Close']].copy())
+    expected = _loop_wyckoff(data.copy())['Phase']
+    assert (wyckoff_method(data.copy())['Phase'].astype(str) == expected).all()
+    scalar = [classify_phase(c, a, b) for c, a, b in zip(data['Close'], data['50_MA'], data['200_MA'])]
+    assert scalar == list(expected)
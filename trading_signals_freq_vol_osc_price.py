@@ -1,12 +1,14 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from scipy.fft import fft, ifft
-import yfinance as yf
+from spectral import high_amplitude_series
+from market_data import download
+from results_store import append_results
+from reporting import PLOTTING, show, signal_scatter
 
 # Download historical data for CL=F (Crude Oil Futures) within the last 3 months with an hourly interval
 symbol = 'CL=F'
-data = yf.download(symbol, period="3mo", interval="1h")
+data = download(symbol, period="3mo", interval="1h")
 
 # Calculate moving averages
 data['50_MA'] = data['Close'].rolling(window=50).mean()
@@ -24,18 +26,9 @@ data = volume_oscillator(data)
 
 # Fourier Transform on Volume Oscillator
 volume_oscillator = data['Vol_Osc'].fillna(0).to_numpy(dtype=float)  # Ensure no NaN values and convert to NumPy array
-fft_values = fft(volume_oscillator)
-frequencies = np.fft.fftfreq(len(fft_values))
 
-# Identify high amplitude frequencies
-amplitudes = np.abs(fft_values)
-threshold = np.percentile(amplitudes, 90)  # Top 10% of amplitudes
-high_amp_indices = np.where(amplitudes > threshold)[0]
-
-# Map to Time Domain
-significant_time_series = np.zeros_like(volume_oscillator, dtype=float)
-for idx in high_amp_indices:
-    significant_time_series += np.real(ifft(fft_values * (np.arange(len(fft_values)) == idx)))
+# Map to Time Domain (top 10% of amplitudes)
+significant_time_series = high_amplitude_series(volume_oscillator, percentile=90)
 
 # Generate Trading Signals based on high amplitude frequencies
 data['Signal'] = np.where(
@@ -44,24 +37,24 @@ data['Signal'] = np.where(
 )
 
 # Save data to a file
-data.to_csv('trading_signals_with_frequency.csv')
+append_results(data, 'trading_signals_with_frequency', symbol)
 
 # Plotting
-fig, ax1 = plt.subplots(figsize=(14, 7))
+if PLOTTING:
+    fig, ax1 = plt.subplots(figsize=(14, 7))
 
-ax1.plot(data.index, data['Close'], label='Price', color='blue')
-ax1.set_ylabel('Price', color='blue')
-ax1.tick_params(axis='y', labelcolor='blue')
+    ax1.plot(data.index, data['Close'], label='Price', color='blue')
+    ax1.set_ylabel('Price', color='blue')
+    ax1.tick_params(axis='y', labelcolor='blue')
 
-ax2 = ax1.twinx()
-ax2.plot(data.index, significant_time_series, label='High Amplitude Frequencies', color='orange')
-ax2.set_ylabel('High Amplitude Frequencies', color='orange')
-ax2.tick_params(axis='y', labelcolor='orange')
+    ax2 = ax1.twinx()
+    ax2.plot(data.index, significant_time_series, label='High Amplitude Frequencies', color='orange')
+    ax2.set_ylabel('High Amplitude Frequencies', color='orange')
+    ax2.tick_params(axis='y', labelcolor='orange')
 
-# Plot Trading Signals
-colors = np.where(data['Signal'] == 'Buy', 'green', np.where(data['Signal'] == 'Sell', 'red', 'gray'))
-ax1.scatter(data.index, data['Close'], c=colors, label='Trading Signals', marker='o')
+    # Plot Trading Signals (Buy/Sell only; Hold bars are the price line itself)
+    signal_scatter(ax1, data.index, data['Close'], data['Signal'])
 
-fig.tight_layout()
-plt.title('Price and High Amplitude Frequency Patterns with Trading Signals')
-plt.show()
+    fig.tight_layout()
+    plt.title('Price and High Amplitude Frequency Patterns with Trading Signals')
+    show()
@@ -0,0 +1,198 @@
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize_scalar
+
+# log(eps^2) for eps ~ N(0, 1): mean and variance of the observation noise
+LOG_CHI2_MEAN = -1.2703628454614782
+LOG_CHI2_VAR = math.pi ** 2 / 2
+
+
+# Log squared returns; zero or missing returns carry no information about the level and become NaN
+def log_squared_returns(returns):
+    returns = np.asarray(returns, dtype=float)
+    with np.errstate(divide='ignore'):
+        y = np.log(returns ** 2)
+    y[~np.isfinite(y)] = np.nan
+    return y - LOG_CHI2_MEAN
+
+
+# Kalman filter for  y[t] = h[t] + e[t],  h[t] = h[t-1] + w[t],  e ~ N(0, pi^2/2), w ~ N(0, sigma^2)
+# Returns filtered means/variances, one-step predictions and the log-likelihood
+def kalman_filter(y, sigma, h0, p0):
+    n = len(y)
+    q = sigma * sigma
+    r = LOG_CHI2_VAR
+    h_filt, p_filt = np.empty(n), np.empty(n)
+    h_pred, p_pred = np.empty(n), np.empty(n)
+    h, p = h0, p0
+    loglik = 0.0
+    for t, obs in enumerate(y.tolist()):
+        p += q
+        h_pred[t], p_pred[t] = h, p
+        if obs == obs:
+            s = p + r
+            innovation = obs - h
+            gain = p / s
+            h += gain * innovation
+            p -= gain * p
+            loglik -= 0.5 * (math.log(2 * math.pi * s) + innovation * innovation / s)
+        h_filt[t], p_filt[t] = h, p
+    return h_filt, p_filt, h_pred, p_pred, loglik
+
+
+# Rauch-Tung-Striebel smoother over the output of kalman_filter
+def rts_smoother(h_filt, p_filt, h_pred, p_pred):
+    n = len(h_filt)
+    h_smooth = h_filt.copy()
+    for t in range(n - 2, -1, -1):
+        gain = p_filt[t] / p_pred[t + 1]
+        h_smooth[t] = h_filt[t] + gain * (h_smooth[t + 1] - h_pred[t + 1])
+    return h_smooth
+
+
+# Linear-time replacement for the pymc3 GaussianRandomWalk stochastic volatility model.
+# Bayesian_Volatility is the smoothed latent log-variance, like the posterior mean of `volatility`.
+# The filter state is kept so later runs only process new bars (warm start).
+class KalmanVolatility:
+    def __init__(self, sigma=None, state=None):
+        self.sigma = sigma
+        self.state = state
+
+    # Maximum-likelihood random-walk scale on log10(sigma)
+    def _estimate_sigma(self, y, h0, p0):
+        def negative_loglik(log_sigma):
+            return -kalman_filter(y, 10 ** log_sigma, h0, p0)[4]
+        result = minimize_scalar(negative_loglik, bounds=(-4, 1), method='bounded', options={'xatol': 1e-3})
+        return 10 ** result.x
+
+    def fit(self, returns):
+        y = log_squared_returns(returns)
+        h0 = float(np.nanmean(y[:100])) if np.isfinite(y[:100]).any() else 0.0
+        p0 = LOG_CHI2_VAR
+        if self.sigma is None:
+            self.sigma = self._estimate_sigma(y, h0, p0)
+        h_filt, p_filt, h_pred, p_pred, _ = kalman_filter(y, self.sigma, h0, p0)
+        self.state = {'sigma': self.sigma, 'h': float(h_filt[-1]), 'p': float(p_filt[-1])}
+        return rts_smoother(h_filt, p_filt, h_pred, p_pred)
+
+    # Continue from the saved state with new returns only; smoothing covers the new bars
+    def update(self, returns):
+        if self.state is None:
+            return self.fit(returns)
+        y = log_squared_returns(returns)
+        h_filt, p_filt, h_pred, p_pred, _ = kalman_filter(y, self.state['sigma'], self.state['h'], self.state['p'])
+        self.state = {'sigma': self.state['sigma'], 'h': float(h_filt[-1]), 'p': float(p_filt[-1])}
+        return rts_smoother(h_filt, p_filt, h_pred, p_pred)
+
+    def save(self, path):
+        with open(path, 'w') as handle:
+            json.dump(self.state, handle)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as handle:
+            state = json.load(handle)
+        return cls(sigma=state['sigma'], state=state)
+
+
+# GARCH(1,1) with persisted parameters: new bars go through the O(1) variance recursion
+# sigma2[t] = omega + alpha * resid[t-1]^2 + beta * sigma2[t-1], with a full arch re-fit only
+# every `refit_every` bars or when the standardized residuals drift away from unit variance
+class GarchVolatility:
+    def __init__(self, params=None, state=None, refit_every=24 * 21, drift_tolerance=0.5, min_drift_bars=100):
+        self.params = params
+        self.state = state
+        self.refit_every = refit_every
+        self.drift_tolerance = drift_tolerance
+        self.min_drift_bars = min_drift_bars
+
+    def fit(self, returns):
+        from arch import arch_model
+
+        result = arch_model(returns, vol='Garch', p=1, q=1).fit(disp='off')
+        self.params = {name: float(result.params[name]) for name in ('mu', 'omega', 'alpha[1]', 'beta[1]')}
+        volatility = np.asarray(result.conditional_volatility, dtype=float)
+        resid = np.asarray(result.resid, dtype=float)
+        self.state = {'sigma2': float(volatility[-1] ** 2), 'resid': float(resid[-1]),
+                      'bars_since_fit': 0, 'z2_sum': 0.0, 'z2_count': 0}
+        if isinstance(returns, pd.Series):
+            return pd.Series(volatility, index=returns.index)
+        return volatility
+
+    # Conditional volatility for new returns only, continuing from the saved state
+    def update(self, returns):
+        mu, omega = self.params['mu'], self.params['omega']
+        alpha, beta = self.params['alpha[1]'], self.params['beta[1]']
+        sigma2, resid = self.state['sigma2'], self.state['resid']
+        values = np.asarray(returns, dtype=float)
+        volatility = np.empty(len(values))
+        z2_sum = 0.0
+        for t, value in enumerate(values.tolist()):
+            sigma2 = omega + alpha * resid * resid + beta * sigma2
+            resid = value - mu
+            volatility[t] = math.sqrt(sigma2)
+            z2_sum += resid * resid / sigma2
+        self.state.update(sigma2=sigma2, resid=resid)
+        self.state['bars_since_fit'] += len(values)
+        self.state['z2_sum'] += z2_sum
+        self.state['z2_count'] += len(values)
+        if isinstance(returns, pd.Series):
+            return pd.Series(volatility, index=returns.index)
+        return volatility
+
+    # True once the refit schedule is due or the mean squared standardized residual leaves 1 +/- tolerance
+    def needs_refit(self):
+        if self.state is None:
+            return True
+        if self.state['bars_since_fit'] >= self.refit_every:
+            return True
+        count = self.state['z2_count']
+        if count >= self.min_drift_bars:
+            return abs(self.state['z2_sum'] / count - 1) > self.drift_tolerance
+        return False
+
+    # Full history in, conditional volatility for the new tail out; re-fits only when needed
+    def refresh(self, returns, new_bars):
+        if new_bars <= 0:
+            if isinstance(returns, pd.Series):
+                return pd.Series(np.empty(0), index=returns.index[:0])
+            return np.empty(0)
+        tail = len(returns) - new_bars
+        if self.needs_refit():
+            return self.fit(returns)[tail:]
+        return self.update(returns[tail:])
+
+    def save(self, path):
+        with open(path, 'w') as handle:
+            json.dump({'params': self.params, 'state': self.state}, handle)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        with open(path) as handle:
+            saved = json.load(handle)
+        return cls(params=saved['params'], state=saved['state'], **kwargs)
+
+
+def _fit_garch(args):
+    symbol, returns = args
+    try:
+        model = GarchVolatility()
+        return symbol, model, model.fit(returns), None
+    except Exception as error:
+        return symbol, None, None, repr(error)
+
+
+# Fit GARCH(1,1) for many symbols across a process pool; returns {symbol: (model, volatility)} and failures
+def fit_garch_many(returns_by_symbol, workers=None):
+    models, failures = {}, {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for symbol, model, volatility, error in executor.map(_fit_garch, returns_by_symbol.items()):
+            if error is None:
+                models[symbol] = (model, volatility)
+            else:
+                failures[symbol] = error
+    return models, failures
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+# Phase labels in the order used for the categorical codes
+PHASES = ['Accumulation', 'Markup', 'Distribution', 'Markdown', 'Unknown']
+UNKNOWN = PHASES.index('Unknown')
+
+
+# Vectorized Wyckoff phase codes (index into PHASES) from Close and the 50/200 MAs
+def wyckoff_codes(close, ma_50, ma_200):
+    close = np.asarray(close, dtype=float)
+    ma_50 = np.asarray(ma_50, dtype=float)
+    ma_200 = np.asarray(ma_200, dtype=float)
+
+    # NaN comparisons are False, so warm-up bars fall through to Unknown like the old loop
+    bullish = ma_50 > ma_200
+    bearish = ma_50 < ma_200
+    between = (close < ma_50) & (close > ma_200)
+    above = close > ma_50
+    below = close < ma_200
+
+    conditions = [
+        bullish & between,
+        bearish & between,
+        (bullish | bearish) & above,
+        (bullish | bearish) & below,
+    ]
+    choices = [
+        PHASES.index('Distribution'),
+        PHASES.index('Accumulation'),
+        PHASES.index('Markup'),
+        PHASES.index('Markdown'),
+    ]
+    return np.select(conditions, choices, default=UNKNOWN).astype(np.int8)
+
+
+# Turn phase codes into a compact categorical Phase column
+def phase_categorical(codes, index=None):
+    return pd.Series(pd.Categorical.from_codes(codes, categories=PHASES), index=index, name='Phase')
+
+
+# Wyckoff Method using Simplified Logic (drop-in for the per-row version in the scripts)
+def wyckoff_method(data):
+    codes = wyckoff_codes(data['Close'], data['50_MA'], data['200_MA'])
+    data['Phase'] = phase_categorical(codes, index=data.index)
+    return data
+
+
+# Scalar version of the same rules, for per-bar streaming updates
+def classify_phase(close, ma_50, ma_200):
+    if ma_50 > ma_200:
+        if ma_200 < close < ma_50:
+            return 'Distribution'
+    elif ma_50 < ma_200:
+        if ma_200 < close < ma_50:
+            return 'Accumulation'
+    else:
+        return 'Unknown'
+    if close > ma_50:
+        return 'Markup'
+    if close < ma_200:
+        return 'Markdown'
+    return 'Unknown'
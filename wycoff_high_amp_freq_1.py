@@ -1,12 +1,15 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from scipy.fft import fft, ifft
-import yfinance as yf
+from spectral import high_amplitude_series
+from market_data import download
+from wyckoff import wyckoff_method
+from results_store import append_results
+from reporting import PLOTTING, show
 
 # Download historical data for NG=F (Natural Gas Futures) within the last 3 months with an hourly interval
 symbol = 'NG=F'
-data = yf.download(symbol, period="3mo", interval="1h")
+data = download(symbol, period="3mo", interval="1h")
 
 # Calculate moving averages
 data['50_MA'] = data['Close'].rolling(window=50).mean()
@@ -24,37 +27,9 @@ data = volume_oscillator(data)
 
 # Fourier Transform on Volume Oscillator
 volume_oscillator = data['Vol_Osc'].fillna(0).to_numpy(dtype=float)  # Ensure no NaN values and convert to NumPy array
-fft_values = fft(volume_oscillator)
-frequencies = np.fft.fftfreq(len(fft_values))
 
-# Identify high amplitude frequencies
-amplitudes = np.abs(fft_values)
-threshold = np.percentile(amplitudes, 90)  # Top 10% of amplitudes
-high_amp_indices = np.where(amplitudes > threshold)[0]
-
-# Map to Time Domain
-significant_time_series = np.zeros_like(volume_oscillator, dtype=float)
-for idx in high_amp_indices:
-    significant_time_series += np.real(ifft(fft_values * (np.arange(len(fft_values)) == idx)))
-
-# Wyckoff Method using Simplified Logic
-def wyckoff_method(data):
-    for i in range(len(data)):
-        if data['50_MA'].iloc[i] > data['200_MA'].iloc[i]:
-            if data['Close'].iloc[i] < data['50_MA'].iloc[i] and data['Close'].iloc[i] > data['200_MA'].iloc[i]:
-                data.loc[data.index[i], 'Phase'] = 'Distribution'
-            elif data['Close'].iloc[i] > data['50_MA'].iloc[i]:
-                data.loc[data.index[i], 'Phase'] = 'Markup'
-            elif data['Close'].iloc[i] < data['200_MA'].iloc[i]:
-                data.loc[data.index[i], 'Phase'] = 'Markdown'
-        elif data['50_MA'].iloc[i] < data['200_MA'].iloc[i]:
-            if data['Close'].iloc[i] < data['50_MA'].iloc[i] and data['Close'].iloc[i] > data['200_MA'].iloc[i]:
-                data.loc[data.index[i], 'Phase'] = 'Accumulation'
-            elif data['Close'].iloc[i] > data['50_MA'].iloc[i]:
-                data.loc[data.index[i], 'Phase'] = 'Markup'
-            elif data['Close'].iloc[i] < data['200_MA'].iloc[i]:
-                data.loc[data.index[i], 'Phase'] = 'Markdown'
-    return data
+# Map to Time Domain (top 10% of amplitudes)
+significant_time_series = high_amplitude_series(volume_oscillator, percentile=90)
 
 # Apply the Wyckoff Method logic
 data = wyckoff_method(data)
@@ -67,27 +42,28 @@ data['Signal'] = np.where(
 )
 
 # Save data to a file
-data.to_csv('trading_signals_with_high_amplitude_wyckoff.csv')
+append_results(data, 'trading_signals_with_high_amplitude_wyckoff', symbol)
 
 # Filter out the non-signal data points before plotting
 filtered_data = data[data['Signal'].notna()]
 
 # Plotting
-fig, ax1 = plt.subplots(figsize=(14, 7))
+if PLOTTING:
+    fig, ax1 = plt.subplots(figsize=(14, 7))
 
-ax1.plot(data.index, data['Close'], label='Price', color='blue')
-ax1.set_ylabel('Price', color='blue')
-ax1.tick_params(axis='y', labelcolor='blue')
+    ax1.plot(data.index, data['Close'], label='Price', color='blue')
+    ax1.set_ylabel('Price', color='blue')
+    ax1.tick_params(axis='y', labelcolor='blue')
 
-ax2 = ax1.twinx()
-ax2.plot(data.index, significant_time_series, label='High Amplitude Frequencies', color='orange')
-ax2.set_ylabel('High Amplitude Frequencies', color='orange')
-ax2.tick_params(axis='y', labelcolor='orange')
+    ax2 = ax1.twinx()
+    ax2.plot(data.index, significant_time_series, label='High Amplitude Frequencies', color='orange')
+    ax2.set_ylabel('High Amplitude Frequencies', color='orange')
+    ax2.tick_params(axis='y', labelcolor='orange')
 
-# Plot Trading Signals - only filtered signals
-colors = np.where(filtered_data['Signal'] == 'Buy', 'green', np.where(filtered_data['Signal'] == 'Sell', 'red', 'gray'))
-ax1.scatter(filtered_data.index, filtered_data['Close'], c=colors, label='Trading Signals', marker='o')
+    # Plot Trading Signals - only filtered signals
+    colors = np.where(filtered_data['Signal'] == 'Buy', 'green', np.where(filtered_data['Signal'] == 'Sell', 'red', 'gray'))
+    ax1.scatter(filtered_data.index, filtered_data['Close'], c=colors, label='Trading Signals', marker='o')
 
-fig.tight_layout()
-plt.title('Price and High Amplitude Frequency Patterns with Trading Signals (Wyckoff Method)')
-plt.show()
+    fig.tight_layout()
+    plt.title('Price and High Amplitude Frequency Patterns with Trading Signals (Wyckoff Method)')
+    show()